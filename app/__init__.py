@@ -1,28 +1,115 @@
 from flask import Flask
 from flask_cors import CORS
+from sqlalchemy.orm.exc import StaleDataError
 from .db import db, migrate
 from .routes.board_routes import boards_bp
 from .routes.card_routes import cards_bp
+from .routes.ops_routes import ops_bp
+from .routes.search_routes import search_bp
+from .routes.route_utilities import handle_stale_data
 from .models import board, card
+from .like_buffer import LikeBuffer
+from .cache import init_response_cache
+from .events import init_event_broker
+from .leaderboard import init_leaderboard
+from .rate_limit import init_rate_limiter
+from .instrumentation import init_instrumentation
+from .engine_options import ENGINE_SETTINGS, build_engine_options, init_engine_events, init_gevent_support
+from .json_provider import init_json_provider
+from .replay import replay_command
+from .soft_delete import purge_command
+from .snapshots import export_command, import_command
+from .aggregates import repair_command
+from .replica import REPLICA_BIND, init_read_replica
+import atexit
 import os
 
+CORS_EXPOSE_HEADERS = ["ETag", "Link", "X-Next-Cursor"]
+
 
 def create_app(config=None):
     app = Flask(__name__)
 
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI')
+    app.config['LIKE_WRITE_BEHIND'] = os.environ.get('LIKE_WRITE_BEHIND') == '1'
+    app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND')
+    app.config['RESPONSE_CACHE_REDIS_URL'] = os.environ.get('RESPONSE_CACHE_REDIS_URL')
+    app.config['EVENT_BROKER'] = os.environ.get('EVENT_BROKER', 'memory')
+    app.config['SERVER_TIMING'] = os.environ.get('SERVER_TIMING') == '1'
+    app.config['RATE_LIMIT_BACKEND'] = os.environ.get('RATE_LIMIT_BACKEND')
+    app.config['RATE_LIMIT_REDIS_URL'] = os.environ.get('RATE_LIMIT_REDIS_URL')
+    app.config['SQLALCHEMY_REPLICA_DATABASE_URI'] = os.environ.get('SQLALCHEMY_REPLICA_DATABASE_URI')
+    app.config['REPLICA_STICKY_SECONDS'] = os.environ.get('REPLICA_STICKY_SECONDS')
+    # Read by flask_cors; comma-separated, default any origin
+    app.config['CORS_ORIGINS'] = os.environ.get('CORS_ORIGINS', '*').split(',')
+    app.config.update({key: os.environ[key] for key in ENGINE_SETTINGS if key in os.environ})
 
     if config:
         app.config.update(config)
 
+    app.config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS',
+        build_engine_options(app.config['SQLALCHEMY_DATABASE_URI'], app.config),
+    )
+
+    # Optional read replica for the GET routes, as a second bind (see app/replica.py)
+    replica_uri = app.config['SQLALCHEMY_REPLICA_DATABASE_URI']
+    if replica_uri:
+        app.config['SQLALCHEMY_BINDS'] = {
+            **app.config.get('SQLALCHEMY_BINDS', {}),
+            REPLICA_BIND: {"url": replica_uri, **build_engine_options(replica_uri, app.config)},
+        }
+
+    # Use orjson for responses when it is installed
+    init_json_provider(app)
+
     # Initialize app with SQLAlchemy db and Migrate
     db.init_app(app)
     migrate.init_app(app, db)
+    init_engine_events(app)
+    init_gevent_support(app)
+    init_instrumentation(app)
+    init_read_replica(app)
+
+    # Optionally buffer likes in memory and write them back in batches
+    if app.config.get("LIKE_WRITE_BEHIND"):
+        like_buffer = LikeBuffer(
+            app,
+            max_pending=app.config.get("LIKE_BUFFER_MAX_PENDING", 100),
+            flush_interval=app.config.get("LIKE_BUFFER_FLUSH_SECONDS", 1.0),
+        )
+        app.extensions["like_buffer"] = like_buffer
+        atexit.register(like_buffer.flush_at_exit)
+
+    # Optional read-through cache for board payloads
+    init_response_cache(app)
+
+    # Optional token buckets for the card write routes
+    init_rate_limiter(app)
+
+    # Fan-out for the board event streams
+    init_event_broker(app)
+
+    # Card rankings for GET /cards/top, kept current from the board events
+    init_leaderboard(app)
 
     # Register Blueprints 
     app.register_blueprint(boards_bp)
     app.register_blueprint(cards_bp)
+    app.register_blueprint(ops_bp)
+    app.register_blueprint(search_bp)
+
+    # flask replay <log.jsonl>, purge-deleted, export-boards / import-boards, repair-board-aggregates
+    app.cli.add_command(replay_command)
+    app.cli.add_command(purge_command)
+    app.cli.add_command(export_command)
+    app.cli.add_command(import_command)
+    app.cli.add_command(repair_command)
+
+    # Optimistic concurrency: a flush that lost a version race answers 409
+    app.register_error_handler(StaleDataError, handle_stale_data)
 
-    CORS(app)
+    # Credentialed, so browsers send the read-replica sticky cookie cross-origin
+    CORS(app, expose_headers=CORS_EXPOSE_HEADERS, supports_credentials=True)
     return app
@@ -0,0 +1,198 @@
+"""Per-board card aggregates: ``card_count``, ``total_likes`` and ``last_card_at``.
+
+The columns on ``boards`` are kept in step by triggers on ``cards``, so
+every write path that adds, deletes or restores cards (routes, the ASGI
+app, snapshot imports, purges) updates them in the same transaction as the
+card rows. Only live cards (``deleted_at IS NULL``) are counted, and
+``last_card_at`` is the ``created_at`` of the newest live card. Deleting or
+restoring a card also sets the board's ``updated_at``, so its
+``Last-Modified`` moves forward even when the newest card is the one gone.
+
+Likes on live cards add their difference to ``total_likes`` in the same
+transaction too, but leave ``updated_at`` alone: the board itself did not
+change. Concurrent likes on one board's cards therefore wait on the
+board's row lock; with ``LIKE_WRITE_BEHIND`` they take it once per card
+per buffer flush instead of once per like.
+
+On Postgres the triggers are statement-level with transition tables, so a
+batch insert updates each board once per statement. SQLite (used by the
+tests) gets equivalent row-level triggers. ``flask
+repair-board-aggregates`` recomputes the columns from the cards.
+"""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, event, func
+from .db import db
+from .models.board import Board
+from .models.card import Card
+
+DEFAULT_REPAIR_BATCH_SIZE = 1000
+
+POSTGRES_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Cards that were deleted or restored
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                updated_at = now(),
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+
+            -- Likes on cards that stayed live, without touching updated_at
+            UPDATE boards SET total_likes = boards.total_likes + liked.likes
+            FROM (
+                SELECT new_rows.board_id, sum(new_rows.likes - old_rows.likes) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE new_rows.deleted_at IS NULL AND old_rows.deleted_at IS NULL AND new_rows.likes <> old_rows.likes
+                GROUP BY new_rows.board_id
+            ) AS liked
+            WHERE boards.id = liked.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            updated_at = now(),
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    "CREATE TRIGGER cards_aggregates_insert AFTER INSERT ON cards REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+    "CREATE TRIGGER cards_aggregates_update AFTER UPDATE ON cards REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+    "CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+]
+
+SQLITE_LAST_CARD_AT = (
+    "(SELECT max(created_at) FROM cards WHERE cards.board_id = OLD.board_id AND cards.deleted_at IS NULL)"
+)
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER cards_aggregates_insert AFTER INSERT ON cards WHEN NEW.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count + 1,
+            total_likes = total_likes + NEW.likes,
+            last_card_at = max(coalesce(last_card_at, NEW.created_at), NEW.created_at)
+        WHERE id = NEW.board_id;
+    END
+    """,
+    """
+    CREATE TRIGGER cards_aggregates_likes AFTER UPDATE OF likes ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NULL AND NEW.likes <> OLD.likes
+    BEGIN
+        UPDATE boards SET total_likes = total_likes + NEW.likes - OLD.likes WHERE id = NEW.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_soft_delete AFTER UPDATE OF deleted_at ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            updated_at = CURRENT_TIMESTAMP,
+            last_card_at = {SQLITE_LAST_CARD_AT}
+        WHERE id = OLD.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards WHEN OLD.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            updated_at = CURRENT_TIMESTAMP,
+            last_card_at = {SQLITE_LAST_CARD_AT}
+        WHERE id = OLD.board_id;
+    END
+    """,
+]
+
+# sqlite3 runs one statement per execute, so every trigger is its own DDL
+for dialect, statements in (("postgresql", POSTGRES_TRIGGERS), ("sqlite", SQLITE_TRIGGERS)):
+    for statement in statements:
+        event.listen(Card.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+
+
+def live_total_likes(boards, cards):
+    live = (cards.c.board_id == boards.c.id) & cards.c.deleted_at.is_(None)
+    return db.select(func.coalesce(func.sum(cards.c.likes), 0)).where(live).scalar_subquery()
+
+
+def repair_board_aggregates(batch_size=DEFAULT_REPAIR_BATCH_SIZE):
+    """Recompute the aggregates of every board from its live cards.
+
+    Works through the boards in id ranges of ``batch_size`` with a commit
+    after each, like a backfill migration. Returns the number of boards.
+    """
+    boards, cards = Board.__table__, Card.__table__
+    live = (cards.c.board_id == boards.c.id) & cards.c.deleted_at.is_(None)
+    values = {
+        "card_count": db.select(func.count()).where(live).scalar_subquery(),
+        "total_likes": live_total_likes(boards, cards),
+        "last_card_at": db.select(func.max(cards.c.created_at)).where(live).scalar_subquery(),
+        # Without this the column's onupdate would touch every board
+        "updated_at": boards.c.updated_at,
+    }
+    repaired = 0
+    after_id = 0
+
+    while True:
+        batch_ids = db.select(boards.c.id).where(boards.c.id > after_id).order_by(boards.c.id).limit(batch_size).subquery()
+        upto_id = db.session.scalar(db.select(func.max(batch_ids.c.id)))
+        if upto_id is None:
+            return repaired
+
+        query = db.update(boards).where(boards.c.id > after_id, boards.c.id <= upto_id).values(**values)
+        repaired += db.session.execute(query).rowcount
+        db.session.commit()
+        after_id = upto_id
+
+
+@click.command("repair-board-aggregates")
+@click.option("--batch-size", type=int, default=DEFAULT_REPAIR_BATCH_SIZE, help="Boards updated per transaction.")
+@with_appcontext
+def repair_command(batch_size):
+    """Recompute card_count, total_likes and last_card_at for every board."""
+    repaired = repair_board_aggregates(batch_size)
+    click.echo(f"Repaired {repaired} boards")
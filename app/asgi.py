@@ -0,0 +1,246 @@
+"""ASGI entry point that serves the hot board and card routes on asyncio.
+
+The plain reads (``GET /boards``, ``GET /boards/<id>``,
+``GET /boards/<id>/cards``, ``GET /cards/<id>``) and
+``PATCH /cards/<id>/like`` run on SQLAlchemy's async engine with the same
+``Board``/``Card`` models and queries as the Flask routes. Everything else
+(other writes, query-string options such as pagination, conditional
+requests, event streams) is handed to the Flask app through asgiref, one
+thread-pool thread per request so an open event stream never holds up the
+others, and behaviour stays the same whichever path serves a request. With a read
+replica configured the GETs read from it, and clients holding the
+primary-pinning cookie are served by Flask.
+
+Needs the packages in requirements-async.txt. Run with::
+
+    uvicorn --factory app.asgi:create_asgi_app --workers 4
+
+or ``gunicorn -k uvicorn.workers.UvicornWorker "app.asgi:create_asgi_app()"``.
+"""
+import asyncio
+import re
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.http import http_date
+from . import CORS_EXPOSE_HEADERS, create_app
+from .cache import invalidate_board
+from .db import db
+from .engine_options import build_engine_options
+from .events import publish_board_event
+from .models.board import Board
+from .models.card import Card
+from .replica import STICKY_COOKIE
+from .routes.route_utilities import make_etag, validators_from_row
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+CONDITIONAL_HEADERS = {b"if-none-match", b"if-modified-since", b"if-match"}
+
+
+def to_async_url(database_uri):
+    url = make_url(database_uri)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+class ThreadPoolWsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs every WSGI call on one shared thread by default, so a
+    # single open event stream would hold up every other Flask request
+    run_wsgi_app = sync_to_async(vars(WsgiToAsgiInstance)["run_wsgi_app"].func, thread_sensitive=False)
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """``WsgiToAsgi`` that runs each request on the event loop's thread pool."""
+
+    async def __call__(self, scope, receive, send):
+        await ThreadPoolWsgiInstance(self.wsgi_application)(scope, receive, send)
+
+
+class AsyncBoardApp:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.fallback = ThreadPoolWsgiToAsgi(flask_app)
+
+        async_url = to_async_url(flask_app.config["SQLALCHEMY_DATABASE_URI"])
+        engine_options = build_engine_options(async_url.render_as_string(hide_password=False), flask_app.config)
+        self.engine = create_async_engine(async_url, **engine_options)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.read_sessions = self.sessions
+
+        # The GET routes read from the replica when there is one (see app/replica.py)
+        replica_uri = flask_app.config.get("SQLALCHEMY_REPLICA_DATABASE_URI")
+        self.replica_engine = None
+        if replica_uri:
+            replica_url = to_async_url(replica_uri)
+            replica_options = build_engine_options(replica_url.render_as_string(hide_password=False), flask_app.config)
+            self.replica_engine = create_async_engine(replica_url, **replica_options)
+            self.read_sessions = async_sessionmaker(self.replica_engine, expire_on_commit=False)
+
+        # Non-numeric ids (and paths such as /cards/top) fall through to Flask
+        self.routes = [
+            ("GET", re.compile(r"/boards"), self.get_all_boards),
+            ("GET", re.compile(r"/boards/(?P<board_id>\d+)"), self.get_one_board),
+            ("GET", re.compile(r"/boards/(?P<board_id>\d+)/cards"), self.get_cards_for_board),
+            ("GET", re.compile(r"/cards/(?P<card_id>\d+)"), self.get_one_card),
+        ]
+        # Buffered, rate-limited or replica-pinning likes go through the Flask route
+        if not {"like_buffer", "rate_limiter", "read_replica"} & flask_app.extensions.keys():
+            self.routes.append(("PATCH", re.compile(r"/cards/(?P<card_id>\d+)/like"), self.like_card))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.handle_lifespan(receive, send)
+            return
+
+        handler, params = self.match(scope)
+        if handler is None:
+            await self.fallback(scope, receive, send)
+            return
+
+        sessions = self.read_sessions if scope["method"] == "GET" else self.sessions
+        async with sessions() as session:
+            status, payload, headers = await handler(session, **params)
+
+        await self.send_json(scope, send, status, payload, headers)
+
+    def match(self, scope):
+        if scope["type"] != "http" or scope["query_string"]:
+            return None, None
+        if any(name in CONDITIONAL_HEADERS for name, _ in scope["headers"]):
+            return None, None
+        # Clients that just wrote read from the primary, through Flask
+        if self.replica_engine is not None and any(
+            name == b"cookie" and STICKY_COOKIE.encode() in value for name, value in scope["headers"]
+        ):
+            return None, None
+
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(scope["path"])
+            if match and scope["method"] == method:
+                return handler, match.groupdict()
+
+        return None, None
+
+    async def handle_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                if self.replica_engine is not None:
+                    await self.replica_engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def get_all_boards(self, session):
+        row = (await session.execute(Board.select_list_validators())).one()
+        boards = (await session.scalars(db.select(Board).order_by(Board.id))).all()
+        boards_response = [board.to_dict_with_card_count() for board in boards]
+        return 200, boards_response, self.validator_headers("/boards", row, last_modified=False)
+
+    async def get_one_board(self, session, board_id):
+        board_id, error = parse_model_id(Board, board_id)
+        if error:
+            return error
+
+        row = (await session.execute(Board.select_validators(board_id))).first()
+        if row is None:
+            return not_found(Board, board_id)
+
+        board = await session.get(Board, board_id)
+        query = Card.select_payloads().where(Card.board_id == board_id).order_by(Card.id)
+        cards = [Card.payload_from_row(card_row) for card_row in await session.execute(query)]
+        return 200, board.to_dict(cards=cards), self.validator_headers(f"/boards/{board_id}", row, versioned=True)
+
+    async def get_cards_for_board(self, session, board_id):
+        board_id, error = parse_model_id(Board, board_id)
+        if error:
+            return error
+
+        row = (await session.execute(Board.select_validators(board_id))).first()
+        if row is None:
+            return not_found(Board, board_id)
+
+        query = Card.select_payloads().where(Card.board_id == board_id).order_by(Card.id)
+        cards_response = [Card.payload_from_row(card_row) for card_row in await session.execute(query)]
+        return 200, cards_response, self.validator_headers(f"/boards/{board_id}/cards", row, versioned=True)
+
+    async def get_one_card(self, session, card_id):
+        card_id, error = parse_model_id(Card, card_id)
+        if error:
+            return error
+
+        row = (await session.execute(Card.select_validators(card_id))).first()
+        if row is None:
+            return not_found(Card, card_id)
+
+        card = await session.get(Card, card_id)
+        return 200, card.to_dict(), self.validator_headers(f"/cards/{card_id}", row, versioned=True)
+
+    async def like_card(self, session, card_id):
+        card_id, error = parse_model_id(Card, card_id)
+        if error:
+            return error
+
+        query = (
+            db.update(Card)
+            .where(Card.id == card_id)
+            .values(likes=Card.likes + 1, version=Card.version + 1)
+            .returning(Card)
+        )
+        card = await session.scalar(query)
+        if card is None:
+            return not_found(Card, card_id)
+
+        card_response = card.to_dict()
+        await session.commit()
+        await asyncio.to_thread(self.notify, card_response["board_id"], "card.liked", card_response)
+
+        return 200, card_response, []
+
+    def notify(self, board_id, event_type, data):
+        with self.flask_app.app_context():
+            invalidate_board(board_id)
+            publish_board_event(board_id, event_type, data)
+
+    def validator_headers(self, path, row, versioned=False, last_modified=True):
+        parts, last_modified = validators_from_row(row, last_modified)
+        etag = make_etag(f"{path}?", parts, parts[0] if versioned else None)
+        headers = [
+            (b"etag", f'"{etag}"'.encode()),
+            (b"cache-control", b"no-cache"),
+        ]
+        if last_modified is not None:
+            headers.append((b"last-modified", http_date(last_modified).encode()))
+        return headers
+
+    async def send_json(self, scope, send, status, payload, headers):
+        body = self.flask_app.json.dumps(payload).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ]
+        if any(name == b"origin" for name, _ in scope["headers"]):
+            headers.append((b"access-control-allow-origin", b"*"))
+            headers.append((b"access-control-expose-headers", ", ".join(CORS_EXPOSE_HEADERS).encode()))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def parse_model_id(cls, model_id):
+    try:
+        return int(model_id), None
+    except ValueError:
+        return None, (400, {"message": f"{cls.__name__} {model_id} invalid"}, [])
+
+
+def not_found(cls, model_id):
+    return 404, {"message": f"{cls.__name__} {model_id} not found"}, []
+
+
+def create_asgi_app(config=None):
+    return AsyncBoardApp(create_app(config))
+
@@ -0,0 +1,247 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import Response, current_app, g
+from .replica import REPLICA_BIND, reads_from_replica
+
+
+class LRUBackend:
+    """In-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisBackend:
+    """Shared cache backend for a redis-py compatible client.
+
+    Any object with ``get``, ``setex`` and ``delete`` works, so tests and
+    local runs can pass a stand-in instead of a real Redis connection.
+    """
+
+    def __init__(self, client, ttl=30, prefix="inspiration-board:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.ttl, json.dumps(value))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+class ResponseCache:
+    """Read-through cache for response payloads with hit/miss counters.
+
+    Each entry keeps the ETag it was built under and is only served to
+    requests with the same ETag. Writes invalidate entries in the worker
+    that handled them, but an entry filled by another worker, or by a build
+    that finished after the invalidation, would otherwise pair the current
+    ETag with an old body.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build, etag=None):
+        entry = self.backend.get(key)
+        if entry is not None and entry["etag"] == etag:
+            self._count(hit=True)
+            return entry["payload"]
+
+        self._count(hit=False)
+        payload = build()
+        self.backend.set(key, {"etag": etag, "payload": payload})
+        return payload
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class RequestCoalescer:
+    """Lets concurrent builds of the same key share one result.
+
+    The first caller for a key runs ``build``; callers that arrive while it
+    is still running wait for it and get the same payload (or exception)
+    instead of querying and serializing again. Nothing is kept once the
+    build finishes, so this only collapses simultaneous requests. Callers
+    only join a build started for the same ``etag``.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, build, etag=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None or call.etag != etag
+            if leader:
+                call = self._calls[key] = _Call(etag)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = build()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def forget(self, *keys):
+        # Callers arriving after a write start a new build instead of joining one that began before it
+        with self._lock:
+            for key in keys:
+                self._calls.pop(key, None)
+
+
+class _Call:
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def board_key(board_id):
+    return f"board:{board_id}"
+
+
+def board_cards_key(board_id):
+    return f"board:{board_id}:cards"
+
+
+def init_response_cache(app):
+    app.extensions["request_coalescer"] = RequestCoalescer()
+
+    backend_name = app.config.get("RESPONSE_CACHE_BACKEND")
+    if not backend_name:
+        return None
+
+    ttl = app.config.get("RESPONSE_CACHE_TTL", 30)
+
+    if backend_name == "lru":
+        backend = LRUBackend(maxsize=app.config.get("RESPONSE_CACHE_MAXSIZE", 1024), ttl=ttl)
+    elif backend_name == "redis":
+        client = app.config.get("RESPONSE_CACHE_CLIENT")
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(app.config["RESPONSE_CACHE_REDIS_URL"])
+        backend = RedisBackend(client, ttl=ttl)
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {backend_name!r}")
+
+    cache = ResponseCache(backend)
+    app.extensions["response_cache"] = cache
+    return cache
+
+
+def bind_key(key):
+    # Replica reads get their own entries, so a lagging replica never fills
+    # the entries that clients pinned to the primary read (see app/replica.py)
+    return f"{REPLICA_BIND}:{key}" if reads_from_replica() else key
+
+
+def current_etag():
+    # Set by conditional_get before the view runs
+    return g.get("response_etag")
+
+
+def cached_payload(key, build):
+    cache = current_app.extensions.get("response_cache")
+    if cache is None:
+        return build()
+    return cache.get_or_build(bind_key(key), build, current_etag())
+
+
+def coalesced_response(key, build):
+    """Build a JSON response once for all concurrent requests for ``key``.
+
+    ``build`` returns the payload; the requests that share it also share
+    its encoded body, so the query and serialization both run once.
+    """
+    json = current_app.json
+
+    def encode():
+        return json.dumps(build())
+
+    coalescer = current_app.extensions.get("request_coalescer")
+    body = encode() if coalescer is None else coalescer.run(bind_key(key), encode, current_etag())
+    return Response(body, mimetype="application/json")
+
+
+def invalidate_board(board_id):
+    keys = (board_key(board_id), board_cards_key(board_id))
+    keys += tuple(f"{REPLICA_BIND}:{key}" for key in keys)
+
+    coalescer = current_app.extensions.get("request_coalescer")
+    if coalescer is not None:
+        coalescer.forget(*keys)
+
+    cache = current_app.extensions.get("response_cache")
+    if cache is not None:
+        cache.delete(*keys)
@@ -1,6 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from .models.base import Base
+from .replica import RoutingSession
 
-db = SQLAlchemy(model_class=Base)
-migrate = Migrate()
\ No newline at end of file
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The search_vector columns and their indexes are managed with raw DDL
+    return not (name or "").endswith("search_vector")
+
+
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
+migrate = Migrate(include_object=include_object)
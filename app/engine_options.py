@@ -0,0 +1,114 @@
+from uuid import uuid4
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from .db import db
+
+ENGINE_SETTINGS = (
+    "SQLALCHEMY_POOL_SIZE",
+    "SQLALCHEMY_MAX_OVERFLOW",
+    "SQLALCHEMY_POOL_TIMEOUT",
+    "SQLALCHEMY_POOL_RECYCLE",
+    "SQLALCHEMY_POOL_PRE_PING",
+    "SQLALCHEMY_STATEMENT_TIMEOUT_MS",
+    "SQLALCHEMY_PGBOUNCER",
+)
+
+
+def build_engine_options(database_uri, config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS for Postgres from the pool settings.
+
+    Every worker process owns its own pool, so the database sees up to
+    ``workers * (pool_size + max_overflow)`` connections.
+
+    With ``SQLALCHEMY_PGBOUNCER`` set, PgBouncer (transaction pooling) does
+    the pooling: SQLAlchemy uses ``NullPool`` and server-side prepared
+    statements are disabled, since a prepared statement would outlive the
+    transaction that owns the server connection.
+    """
+    if not database_uri:
+        return {}
+
+    url = make_url(database_uri)
+    if url.get_backend_name() != "postgresql":
+        return {}
+
+    options = {"pool_pre_ping": _get_bool(config, "SQLALCHEMY_POOL_PRE_PING", True)}
+    connect_args = {}
+
+    if _get_bool(config, "SQLALCHEMY_PGBOUNCER", False):
+        options["poolclass"] = NullPool
+        if url.get_driver_name() == "asyncpg":
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["statement_cache_size"] = 0
+            # Unique names so statements never collide on a shared server connection
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        # The statement timeout is set per transaction, see init_engine_events
+    else:
+        options["pool_size"] = _get_int(config, "SQLALCHEMY_POOL_SIZE", 5)
+        options["max_overflow"] = _get_int(config, "SQLALCHEMY_MAX_OVERFLOW", 10)
+        options["pool_timeout"] = _get_int(config, "SQLALCHEMY_POOL_TIMEOUT", 30)
+        options["pool_recycle"] = _get_int(config, "SQLALCHEMY_POOL_RECYCLE", 1800)
+
+        statement_timeout = _get_int(config, "SQLALCHEMY_STATEMENT_TIMEOUT_MS", None)
+        if statement_timeout is not None and url.get_driver_name() == "psycopg2":
+            connect_args["options"] = f"-c statement_timeout={statement_timeout}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def init_engine_events(app):
+    """PgBouncer drops startup options, so apply the timeout with SET LOCAL."""
+    statement_timeout = _get_int(app.config, "SQLALCHEMY_STATEMENT_TIMEOUT_MS", None)
+    if statement_timeout is None or not _get_bool(app.config, "SQLALCHEMY_PGBOUNCER", False):
+        return
+
+    def set_statement_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {statement_timeout}")
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "postgresql":
+                event.listen(engine, "begin", set_statement_timeout)
+
+
+def init_gevent_support(app):
+    """Let psycopg2 queries yield to other greenlets under gevent workers.
+
+    psycopg2 talks to the server in C, out of reach of gevent's monkey
+    patching, so without psycogreen one slow query blocks every request
+    (and event stream) of the worker.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+
+    if not monkey.is_module_patched("socket"):
+        return False
+
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        app.logger.warning("Running under gevent without psycogreen: database queries block the worker")
+        return False
+
+    patch_psycopg()
+    return True
+
+
+def _get_int(config, key, default):
+    value = config.get(key)
+    return default if value in (None, "") else int(value)
+
+
+def _get_bool(config, key, default):
+    value = config.get(key)
+    if value in (None, ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,190 @@
+import json
+import queue
+import select
+import threading
+from collections import defaultdict
+from flask import Response, current_app
+from sqlalchemy import text
+from .db import db
+
+EVENT_CHANNEL = "board_events"
+RESYNC_EVENT = "resync"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7999
+
+
+class InProcessBroker:
+    """Fans out board events to the SSE subscribers of this process.
+
+    Each subscriber gets a bounded queue so a slow subscriber never blocks
+    writers. When its queue is full, the events it has not read yet are
+    replaced by one ``resync`` event, telling the client to reload the board
+    instead of carrying on with a gap. Listeners (see ``add_listener``) are called with every event, whatever
+    the board.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        pass
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def subscribe(self, board_id):
+        subscription = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[board_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, board_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(board_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[board_id]
+
+    def publish(self, board_id, event):
+        self._deliver(board_id, event)
+
+    def _deliver(self, board_id, event):
+        for listener in self._listeners:
+            listener(board_id, event)
+
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                self._resync(board_id, subscription)
+
+    @staticmethod
+    def _resync(board_id, subscription):
+        try:
+            while True:
+                subscription.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            subscription.put_nowait(resync_event(board_id))
+        except queue.Full:
+            pass
+
+
+class PostgresBroker(InProcessBroker):
+    """Relays events through Postgres LISTEN/NOTIFY so every worker sees them.
+
+    Publishing sends ``NOTIFY``; one listener thread per process (started on
+    the first subscription or ``start`` call, so after gunicorn forks) hands
+    notifications to the local subscribers and listeners.
+    """
+
+    def __init__(self, engine, queue_size=100, poll_seconds=5):
+        super().__init__(queue_size)
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._listener = None
+
+    def start(self):
+        self._ensure_listener()
+
+    def subscribe(self, board_id):
+        self._ensure_listener()
+        return super().subscribe(board_id)
+
+    def publish(self, board_id, event):
+        payload = json.dumps({"board_id": board_id, "event": event})
+        if len(payload.encode()) > MAX_NOTIFY_BYTES:
+            # Too big for NOTIFY (e.g. a large bulk create): have every
+            # subscriber reload the board instead
+            payload = json.dumps({"board_id": board_id, "event": resync_event(board_id)})
+
+        with self.engine.connect() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": EVENT_CHANNEL, "payload": payload},
+            )
+            connection.commit()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        connection = self.engine.raw_connection()
+        dbapi_connection = connection.driver_connection
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {EVENT_CHANNEL}")
+
+        while True:
+            readable, _, _ = select.select([dbapi_connection], [], [], self.poll_seconds)
+            if not readable:
+                continue
+
+            dbapi_connection.poll()
+            while dbapi_connection.notifies:
+                notification = dbapi_connection.notifies.pop(0)
+                message = json.loads(notification.payload)
+                self._deliver(message["board_id"], message["event"])
+
+
+def init_event_broker(app):
+    if app.config.get("EVENT_BROKER") == "postgres":
+        with app.app_context():
+            broker = PostgresBroker(db.engine)
+    else:
+        broker = InProcessBroker()
+
+    app.extensions["event_broker"] = broker
+    return broker
+
+
+def publish_board_event(board_id, event_type, data):
+    broker = current_app.extensions.get("event_broker")
+    if broker is not None:
+        broker.publish(board_id, {"type": event_type, "data": data})
+
+
+def resync_event(board_id):
+    return {"type": RESYNC_EVENT, "data": {"board_id": board_id}}
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+def create_event_stream_response(board_id):
+    broker = current_app.extensions["event_broker"]
+    keepalive_seconds = current_app.config.get("EVENTS_KEEPALIVE_SECONDS", 15)
+
+    # Subscribe now, not when the body starts streaming, so no event is missed
+    subscription = broker.subscribe(board_id)
+
+    def generate():
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = subscription.get(timeout=keepalive_seconds)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.call_on_close(lambda: broker.unsubscribe(board_id, subscription))
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import defaultdict
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from .db import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Per-process request metrics rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.latency = {}
+        self.response_size = {}
+        self.db_statements = defaultdict(int)
+        self.db_time = defaultdict(float)
+
+    def observe_request(self, endpoint, method, status, duration, query_count, db_time, size):
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            self.latency.setdefault((endpoint, method), Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.db_statements[(endpoint, method)] += query_count
+            self.db_time[(endpoint, method)] += db_time
+            if size is not None:
+                self.response_size.setdefault((endpoint, method), Histogram(SIZE_BUCKETS)).observe(size)
+
+    def render(self, extra_counters=()):
+        with self._lock:
+            lines = []
+            _render_counter(lines, "http_requests_total", "Requests handled",
+                            ("endpoint", "method", "status"), self.requests)
+            _render_histogram(lines, "http_request_duration_seconds", "Request latency",
+                              ("endpoint", "method"), self.latency)
+            _render_histogram(lines, "http_response_size_bytes", "Response body size",
+                              ("endpoint", "method"), self.response_size)
+            _render_counter(lines, "db_statements_total", "SQL statements executed",
+                            ("endpoint", "method"), self.db_statements)
+            _render_counter(lines, "db_time_seconds_total", "Time spent executing SQL",
+                            ("endpoint", "method"), self.db_time)
+
+        for name, description, value in extra_counters:
+            _render_counter(lines, name, description, (), {(): value})
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_counter(lines, name, description, label_names, values):
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels(label_names, labels)} {value}")
+
+
+def _render_histogram(lines, name, description, label_names, histograms):
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, histogram in sorted(histograms.items()):
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{_format_labels(label_names, labels, [('le', bound)])} {count}")
+        lines.append(f"{name}_bucket{_format_labels(label_names, labels, [('le', '+Inf')])} {histogram.total}")
+        lines.append(f"{name}_sum{_format_labels(label_names, labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(label_names, labels)} {histogram.total}")
+
+
+def init_instrumentation(app):
+    """Record per-request latency, SQL statement counts, DB time and response size.
+
+    Metrics are kept in ``app.extensions["metrics"]`` and served at
+    ``/metrics``. The statement count is also sent as ``X-Query-Count`` in
+    debug/testing mode or when ``QUERY_COUNT_HEADER`` is set, and a
+    ``Server-Timing`` header is added when ``SERVER_TIMING`` is set.
+    """
+    metrics = MetricsRegistry()
+    app.extensions["metrics"] = metrics
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+
+    def observe(status, size):
+        duration = time.perf_counter() - g.get("request_start", time.perf_counter())
+        query_count = get_query_count()
+        db_time = g.get("db_time", 0.0)
+        g.request_observed = True
+
+        metrics.observe_request(
+            request.endpoint or "unmatched",
+            request.method,
+            status,
+            duration,
+            query_count,
+            db_time,
+            size,
+        )
+        return duration, query_count, db_time
+
+    @app.before_request
+    def start_request_timer():
+        # g outlives the request when an app context was already pushed
+        g.query_count = 0
+        g.db_time = 0.0
+        g.request_start = time.perf_counter()
+        g.request_observed = False
+
+    @app.after_request
+    def record_request_metrics(response):
+        size = None if response.is_streamed else response.calculate_content_length()
+        duration, query_count, db_time = observe(response.status_code, size)
+
+        if app.debug or app.testing or app.config.get("QUERY_COUNT_HEADER"):
+            response.headers["X-Query-Count"] = str(query_count)
+        if app.config.get("SERVER_TIMING"):
+            response.headers["Server-Timing"] = (
+                f'db;dur={db_time * 1000:.2f};desc="{query_count} queries", '
+                f"app;dur={duration * 1000:.2f}"
+            )
+        return response
+
+    @app.teardown_request
+    def record_failed_request(error):
+        # When the error propagates (debug/testing) no after_request handler runs
+        if error is not None and not g.get("request_observed", True):
+            observe(500, None)
+
+
+def get_query_count():
+    return g.get("query_count", 0)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        g.query_count = g.get("query_count", 0) + 1
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if has_request_context() and start_times:
+        g.db_time = g.get("db_time", 0.0) + time.perf_counter() - start_times.pop()
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, so drop its start time here
+    connection = exception_context.connection
+    start_times = connection.info.get("query_start_times") if connection is not None else None
+    if start_times:
+        started = start_times.pop()
+        if has_request_context():
+            g.db_time = g.get("db_time", 0.0) + time.perf_counter() - started
@@ -0,0 +1,214 @@
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timezone
+from flask import current_app
+from .db import db
+from .models.card import Card
+
+LEADERBOARD_MODES = ("likes", "trending")
+
+
+class RankedSet:
+    """Members kept sorted by score (highest first, newest id first on ties).
+
+    Updates are a binary search plus a list insert, so reading the top N
+    never sorts anything.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, member):
+        return self._scores.get(member)
+
+    def load(self, scores):
+        # One sort for the initial fill instead of an insort per member
+        self._scores = dict(scores)
+        self._keys = sorted((-score, -member) for member, score in self._scores.items())
+
+    def set(self, member, score):
+        old_score = self._scores.get(member)
+        if old_score == score:
+            return
+        if old_score is not None:
+            self._remove_key((-old_score, -member))
+
+        self._scores[member] = score
+        insort(self._keys, (-score, -member))
+
+    def discard(self, member):
+        old_score = self._scores.pop(member, None)
+        if old_score is not None:
+            self._remove_key((-old_score, -member))
+
+    def top(self, limit):
+        return [(-member, -score) for score, member in self._keys[:limit]]
+
+    def _remove_key(self, key):
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+
+class Leaderboard:
+    """In-memory card rankings by total likes and by time-decayed likes.
+
+    The trending score of a card is the sum of ``2 ** (-age / half_life)``
+    over its likes. Every score decays at the same rate, so the ranking only
+    changes when a like arrives; scores are stored as
+    ``log2(sum(2 ** (liked_at / half_life)))`` so a like is one update and
+    nothing has to be recomputed as time passes.
+
+    The rankings are loaded from the database once, on first use, and then
+    kept current from the board events (see ``apply_event``).
+    """
+
+    def __init__(self, half_life=6 * 60 * 60, clock=time.time):
+        self.half_life = half_life
+        self.clock = clock
+        self._epoch = clock()
+        self._likes = RankedSet()
+        self._trending = RankedSet()
+        self._board_cards = defaultdict(set)
+        self._lock = threading.Lock()
+        # Held for the whole load so concurrent first requests query only once
+        self._load_lock = threading.Lock()
+        self._loaded = False
+
+    def ensure_loaded(self):
+        if self._loaded:
+            return
+
+        with self._load_lock:
+            if self._loaded:
+                return
+
+            rows = db.session.execute(db.select(Card.id, Card.board_id, Card.likes, Card.updated_at))
+            board_cards, likes_scores, trending_scores = defaultdict(set), {}, {}
+            for card_id, board_id, likes, updated_at in rows:
+                board_cards[board_id].add(card_id)
+                likes_scores[card_id] = likes
+                # Past like times are unknown, so count them all as of the last update
+                trending_scores[card_id] = self._log_score(likes, self._timestamp(updated_at))
+
+            likes_ranking, trending_ranking = RankedSet(), RankedSet()
+            likes_ranking.load(likes_scores)
+            trending_ranking.load(trending_scores)
+
+            with self._lock:
+                self._likes, self._trending, self._board_cards = likes_ranking, trending_ranking, board_cards
+                self._loaded = True
+
+    def reset(self):
+        # Reload from the database on next use, e.g. after rows were added in bulk
+        with self._lock:
+            self._likes = RankedSet()
+            self._trending = RankedSet()
+            self._board_cards = defaultdict(set)
+            self._loaded = False
+
+    def top(self, mode, limit):
+        with self._lock:
+            if mode == "likes":
+                return self._likes.top(limit)
+
+            now = self._exponent(self.clock())
+            return [
+                (card_id, 2 ** (score - now) if score > -math.inf else 0.0)
+                for card_id, score in self._trending.top(limit)
+            ]
+
+    def set_likes(self, board_id, card_id, likes):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._board_cards[board_id].add(card_id)
+            self._likes.set(card_id, likes)
+            if self._trending.score(card_id) is None:
+                self._trending.set(card_id, -math.inf)
+
+    def record_like(self, board_id, card_id, likes):
+        with self._lock:
+            if not self._loaded:
+                return
+            self._board_cards[board_id].add(card_id)
+            self._likes.set(card_id, likes)
+            score = self._trending.score(card_id)
+            like_score = self._exponent(self.clock())
+            self._trending.set(card_id, like_score if score is None else _log2_add(score, like_score))
+
+    def remove(self, board_id, card_id):
+        with self._lock:
+            self._board_cards[board_id].discard(card_id)
+            self._likes.discard(card_id)
+            self._trending.discard(card_id)
+
+    def remove_board(self, board_id):
+        with self._lock:
+            for card_id in self._board_cards.pop(board_id, ()):
+                self._likes.discard(card_id)
+                self._trending.discard(card_id)
+
+    def apply_event(self, board_id, event):
+        event_type, data = event["type"], event["data"]
+
+        if event_type in ("card.created", "card.updated"):
+            self.set_likes(board_id, data["id"], data["likes"])
+        elif event_type == "card.liked":
+            self.record_like(board_id, data["id"], data["likes"])
+        elif event_type == "card.deleted":
+            self.remove(board_id, data["id"])
+        elif event_type == "cards.created":
+            for card in data:
+                self.set_likes(board_id, card["id"], card["likes"])
+        elif event_type == "cards.deleted":
+            for card_id in data["ids"]:
+                self.remove(board_id, card_id)
+        elif event_type == "board.deleted":
+            self.remove_board(board_id)
+        elif event_type == "resync":
+            # The event that was too big to relay is unknown here
+            self.reset()
+
+    def _exponent(self, timestamp):
+        return (timestamp - self._epoch) / self.half_life
+
+    def _log_score(self, likes, timestamp):
+        if likes <= 0:
+            return -math.inf
+        return math.log2(likes) + self._exponent(timestamp)
+
+    @staticmethod
+    def _timestamp(value):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+
+
+def _log2_add(a, b):
+    # log2(2 ** a + 2 ** b) without overflowing
+    high, low = max(a, b), min(a, b)
+    if low == -math.inf:
+        return high
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def init_leaderboard(app):
+    leaderboard = Leaderboard(half_life=app.config.get("LEADERBOARD_TRENDING_HALF_LIFE", 6 * 60 * 60))
+    app.extensions["leaderboard"] = leaderboard
+    app.extensions["event_broker"].add_listener(leaderboard.apply_event)
+    return leaderboard
+
+
+def get_leaderboard():
+    current_app.extensions["event_broker"].start()
+    leaderboard = current_app.extensions["leaderboard"]
+    leaderboard.ensure_loaded()
+    return leaderboard
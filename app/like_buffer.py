@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import Counter
+from sqlalchemy import bindparam
+from .cache import invalidate_board
+from .db import db
+from .models.card import Card
+
+
+class LikeBuffer:
+    """Write-behind buffer for card likes.
+
+    Likes are counted in memory and flushed to the database as one batched
+    ``UPDATE cards SET likes = likes + :n`` per card, either when enough likes
+    are pending or when the flush interval has passed. Reads may lag behind
+    by up to ``flush_interval`` seconds, and likes still pending when a
+    worker is killed are lost.
+    """
+
+    def __init__(self, app, max_pending=100, flush_interval=1.0):
+        self.app = app
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def add(self, card_id):
+        with self._lock:
+            self._pending[card_id] += 1
+            pending = self._pending[card_id]
+            total = sum(self._pending.values())
+
+        if total >= self.max_pending:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+        return pending
+
+    def pending(self, card_id):
+        with self._lock:
+            return self._pending[card_id]
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+
+        if not batch:
+            return 0
+
+        cards = Card.__table__
+        query = (
+            db.update(cards)
+            .where(cards.c.id == bindparam("card_key"))
+            .values(likes=cards.c.likes + bindparam("increment"), version=cards.c.version + 1)
+        )
+        params = [{"card_key": card_id, "increment": count} for card_id, count in batch.items()]
+
+        try:
+            # Use a separate app context so we never commit the caller's session
+            with self.app.app_context():
+                db.session.execute(query, params)
+                board_ids = db.session.scalars(
+                    db.select(cards.c.board_id).where(cards.c.id.in_(batch.keys())).distinct()
+                ).all()
+                db.session.commit()
+
+                # Payloads cached between a like and this flush hold the old counts
+                for board_id in board_ids:
+                    invalidate_board(board_id)
+        except Exception:
+            with self._lock:
+                self._pending.update(batch)
+            raise
+
+        return len(params)
+
+    def flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            self.app.logger.exception("Failed to flush buffered likes at exit")
+
+    def _ensure_flusher(self):
+        # Started lazily so each forked worker gets its own thread
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception("Failed to flush buffered likes")
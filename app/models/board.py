@@ -1,19 +1,44 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import DDL, Integer, String, DateTime, Index, event, func
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from ..db import db
 
 
 class Board(db.Model):
     __tablename__ = "boards"
+    __table_args__ = (
+        # Owner listings: exact owner, optionally a title prefix (pattern ops so LIKE 'x%' can use it)
+        Index("ix_boards_owner_title", "owner", "title", postgresql_ops={"title": "varchar_pattern_ops"}),
+        # Owner listings are paged by id (WHERE id > cursor ORDER BY id), which the title index cannot serve
+        Index("ix_boards_owner_id", "owner", "id"),
+        Index(
+            "ix_boards_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     owner: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Set on delete; queries skip these rows (see app/soft_delete.py) until they are purged
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), index=True)
+    # Aggregates of the live cards, maintained by triggers on cards (see app/aggregates.py)
+    card_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total_likes: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    last_card_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    # Bumped on every update of the board itself (not by the aggregate triggers)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
 
-    cards: Mapped[List["Card"]] = relationship("Card", back_populates="board", cascade="all, delete-orphan")
+    # Purged boards take their cards with them through ON DELETE CASCADE
+    cards: Mapped[List["Card"]] = relationship(
+        "Card", back_populates="board", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
 
     @classmethod
@@ -21,12 +46,15 @@ class Board(db.Model):
         new_board = Board(title=board_data["title"], owner=board_data["owner"])
         return new_board
     
-    def to_dict(self):
+    def to_dict(self, cards=None):
+        if cards is None:
+            cards = [card.to_dict() for card in self.cards]
+
         return {
             "id": self.id,
             "title": self.title,
             "owner": self.owner,
-            "cards": [card.to_dict() for card in self.cards],
+            "cards": cards,
         }
 
     def to_dict_with_card_count(self):
@@ -34,18 +62,54 @@ class Board(db.Model):
             "id": self.id,
             "title": self.title,
             "owner": self.owner,
-            "card_count": len(self.cards),
+            "card_count": self.card_count,
+            "total_likes": self.total_likes,
+            "last_card_at": self.last_card_at.isoformat() if self.last_card_at else None,
         }
 
     def to_dict_with_cards(self):
         return self.to_dict()
 
     @classmethod
-    def get_by_id(cls, board_id):
-        board = db.session.get(cls, board_id)
-        
-        if board is None:
-            return {"message": f"Board with ID {board_id} not found"}, 404
-        return board, 200
+    def select_list_validators(cls, *filters):
+        # Cheap values that change whenever the board listing does, without reading cards
+        return db.select(
+            func.count(cls.id),
+            func.max(cls.updated_at),
+            func.sum(cls.version),
+            func.sum(cls.card_count),
+            func.sum(cls.total_likes),
+            func.max(cls.last_card_at),
+        ).where(*filters)
+
+    @classmethod
+    def select_validators(cls, board_id):
+        # Cheap values that change whenever the board or its cards do; the
+        # version comes first, it prefixes the ETag for If-Match
+        from .card import Card
+
+        return (
+            db.select(
+                cls.version,
+                cls.updated_at,
+                func.count(Card.id),
+                func.max(Card.updated_at),
+                func.sum(Card.likes),
+                func.sum(Card.version),
+            )
+            .outerjoin(cls.cards)
+            .where(cls.id == board_id)
+            .group_by(cls.id)
+        )
 
 
+# Full-text search vector, maintained by Postgres itself (see app/search.py)
+event.listen(
+    Board.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE boards ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(owner, ''))) STORED; "
+        "CREATE INDEX ix_boards_search_vector ON boards USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
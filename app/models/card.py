@@ -1,19 +1,52 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import DDL, Integer, String, ForeignKey, DateTime, Index, event, func
 from datetime import datetime
+from typing import Optional
 from ..db import db
 
 class Card(db.Model):
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_board_id_id", "board_id", "id"),
+        # Back the ?sort= orders of GET /boards/<id>/cards (scanned backwards)
+        Index("ix_cards_board_id_likes_id", "board_id", "likes", "id"),
+        Index("ix_cards_board_id_created_at_id", "board_id", "created_at", "id"),
+        Index("ix_cards_board_id_updated_at_id", "board_id", "updated_at", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     message: Mapped[str] = mapped_column(String(255), nullable=False)
     likes: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id"), nullable=False)
+    board_id: Mapped[int] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), index=True)
+    # Bumped on every update; ORM flushes check it, UPDATE statements bump it themselves
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
 
     board: Mapped["Board"] = relationship("Board", back_populates="cards")
 
+    __mapper_args__ = {"version_id_col": version}
+
+    MAX_MESSAGE_LENGTH = 40
+
+    @classmethod
+    def is_valid_message(cls, message):
+        return isinstance(message, str) and 0 < len(message) <= cls.MAX_MESSAGE_LENGTH
+
+    @classmethod
+    def select_validators(cls, card_id):
+        # The version comes first: it prefixes the ETag for If-Match
+        return db.select(cls.version, cls.updated_at, cls.likes).where(cls.id == card_id)
+
+    @classmethod
+    def select_payloads(cls):
+        # Columns of to_dict, so rows can be serialized without building Card objects
+        return db.select(cls.id, cls.message, cls.likes, cls.board_id)
+
+    @staticmethod
+    def payload_from_row(row):
+        return row._asdict()
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -28,4 +61,16 @@ class Card(db.Model):
             message=data["message"],
             likes=data.get("likes", 0),
             board_id=data["board_id"],
-        )
\ No newline at end of file
+        )
+
+
+# Full-text search vector, maintained by Postgres itself (see app/search.py)
+event.listen(
+    Card.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE cards ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(message, ''))) STORED; "
+        "CREATE INDEX ix_cards_search_vector ON cards USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request
+
+# Atomic token bucket: KEYS[1] holds "tokens updated_at"; returns {allowed, retry_after_ms}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('GET', KEYS[1])
+local tokens, updated_at = capacity, now
+if state then
+  local space = string.find(state, ' ')
+  tokens = tonumber(string.sub(state, 1, space - 1))
+  updated_at = tonumber(string.sub(state, space + 1))
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('SET', KEYS[1], tokens .. ' ' .. now, 'PX', math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, retry_after}
+"""
+
+
+class MemoryBucketBackend:
+    """Token buckets held in this process, least recently used dropped first.
+
+    A dropped bucket starts full again, which only ever lets a client
+    through, so ``maxsize`` bounds memory without wrongly limiting anyone.
+    """
+
+    def __init__(self, maxsize=100_000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        now = self.clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return retry_after == 0, retry_after
+
+
+class RedisBucketBackend:
+    """Token buckets shared by every worker, updated by one Lua script call.
+
+    Works with any redis-py compatible client that has ``eval``.
+    """
+
+    def __init__(self, client, prefix="inspiration-board:rate:", clock=time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    def take(self, key, capacity, rate):
+        allowed, retry_after_ms = self.client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, capacity, rate, self.clock()
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+
+def init_rate_limiter(app):
+    backend_name = app.config.get("RATE_LIMIT_BACKEND")
+    if not backend_name:
+        return None
+
+    if backend_name == "memory":
+        backend = MemoryBucketBackend()
+    elif backend_name == "redis":
+        client = app.config.get("RATE_LIMIT_CLIENT")
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(app.config["RATE_LIMIT_REDIS_URL"])
+        backend = RedisBucketBackend(client)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend_name!r}")
+
+    app.extensions["rate_limiter"] = backend
+    return backend
+
+
+def bucket_part(value):
+    # Ids are validated with int(), so /cards/01 and /cards/1 must share a bucket
+    try:
+        return str(int(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def rate_limit(name, capacity, per_second):
+    """Limit a route with a token bucket per client and route arguments.
+
+    Each client (by remote address) gets ``capacity`` requests at once,
+    refilled at ``per_second``, separately for every value of the view
+    arguments (so per card on card routes). Over the limit the view is not
+    called and the response is ``429`` with ``Retry-After``. Override the
+    limits with the ``RATE_LIMIT_<NAME>`` config key, a
+    ``(capacity, per_second)`` pair.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            backend = current_app.extensions.get("rate_limiter")
+            if backend is None:
+                return view(*args, **kwargs)
+
+            bucket_capacity, rate = current_app.config.get(f"RATE_LIMIT_{name.upper()}", (capacity, per_second))
+            key = ":".join([name, request.remote_addr or "-", *(bucket_part(value) for value in kwargs.values())])
+            allowed, retry_after = backend.take(key, bucket_capacity, rate)
+
+            if not allowed:
+                response = make_response({"details": "Too many requests"}, 429)
+                response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                return response
+
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,225 @@
+import csv
+import http.client
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def load_request_log(path):
+    """Read the replayable entries of a JSONL request log.
+
+    Each line is ``{"method": "GET", "path": "/boards/1"}``, optionally with
+    ``json`` (request body) and ``headers``. Lines that are not valid JSON
+    (e.g. the truncated last line of a log still being written) or have no
+    ``path`` are skipped and counted.
+    """
+    entries, skipped = [], 0
+    with open(path, errors="replace") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+                skipped += 1
+                continue
+            entries.append({
+                "method": entry.get("method", "GET").upper(),
+                "path": entry["path"],
+                "json": entry.get("json"),
+                "headers": entry.get("headers") or {},
+            })
+    return entries, skipped
+
+
+class TestClientSender:
+    """Sends requests through the app's test client, in this process."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, entry):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        response = client.open(entry["path"], method=entry["method"], json=entry["json"], headers=entry["headers"])
+        response.close()
+        return response.status_code
+
+
+class HttpSender:
+    """Sends requests to a running server over keep-alive HTTP connections."""
+
+    def __init__(self, base_url, timeout=30):
+        url = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        self.host = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, entry):
+        headers = dict(entry["headers"])
+        body = None
+        if entry["json"] is not None:
+            body = json.dumps(entry["json"])
+            headers["Content-Type"] = "application/json"
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self.connection_class(self.host, timeout=self.timeout)
+
+        try:
+            connection.request(entry["method"], self.prefix + entry["path"], body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            raise
+        return response.status
+
+
+def replay(entries, sender, rate=0, concurrency=1):
+    """Send the entries in order, starting one every ``1 / rate`` seconds.
+
+    Start times are scheduled up front (open loop), so a slow response does
+    not slow the offered rate down, as long as ``concurrency`` is enough to
+    keep up. ``rate=0`` sends as fast as the workers allow. Returns one
+    ``(entry, status, latency_ms, lag_ms)`` sample per entry; ``status`` and
+    ``latency_ms`` are None when the request raised, and ``lag_ms`` is how
+    late it started.
+    """
+    start = time.perf_counter()
+    samples = [None] * len(entries)
+    next_index = iter(range(len(entries)))
+    index_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with index_lock:
+                index = next(next_index, None)
+            if index is None:
+                return
+
+            scheduled = start + index / rate if rate else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            sent = time.perf_counter()
+            try:
+                status = sender.send(entries[index])
+                latency = (time.perf_counter() - sent) * 1000
+            except Exception:
+                # An error, not a data point: a refused connection fails in no time
+                status, latency = None, None
+            samples[index] = (entries[index], status, latency, max(0.0, sent - scheduled) * 1000)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    by_endpoint = defaultdict(list)
+    for entry, status, latency, _ in samples:
+        by_endpoint[endpoint_name(entry)].append((status, latency))
+
+    endpoints = {}
+    for endpoint, values in sorted(by_endpoint.items()):
+        latencies = [latency for _, latency in values if latency is not None]
+        statuses = Counter("error" if status is None else str(status) for status, _ in values)
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "statuses": dict(sorted(statuses.items())),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": max(latencies, default=0.0),
+        }
+
+    return {
+        "requests": len(samples),
+        "seconds": elapsed,
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "errors": sum(1 for _, status, _, _ in samples if status is None or status >= 500),
+        "max_lag_ms": max((lag for _, _, _, lag in samples), default=0.0),
+        "endpoints": endpoints,
+    }
+
+
+def endpoint_name(entry):
+    path = entry["path"].split("?", 1)[0]
+    return f"{entry['method']} {ID_SEGMENT.sub('/<id>', path)}"
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def write_samples(path, samples):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["method", "path", "status", "latency_ms", "lag_ms"])
+        for entry, status, latency, lag in samples:
+            latency = "" if latency is None else f"{latency:.3f}"
+            writer.writerow([entry["method"], entry["path"], status or "", latency, f"{lag:.3f}"])
+
+
+@click.command("replay")
+@click.argument("log", type=click.Path(exists=True, dir_okay=False))
+@click.option("--rate", type=float, default=0, help="Requests started per second (0 = as fast as possible).")
+@click.option("--concurrency", type=int, default=4, help="Requests in flight at once.")
+@click.option("--target", help="Base URL of a running server; defaults to the in-process test client.")
+@click.option("--repeat", type=int, default=1, help="Replay the log this many times.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the summary as JSON to this file.")
+@click.option("--samples", type=click.Path(dir_okay=False), help="Write every request's status and latency as CSV.")
+@with_appcontext
+def replay_command(log, rate, concurrency, target, repeat, output, samples):
+    """Replay a JSONL request log against the app and summarize latency and status."""
+    entries, skipped = load_request_log(log)
+    entries *= repeat
+    if not entries:
+        raise click.ClickException(f"no replayable requests in {log}")
+
+    sender = HttpSender(target) if target else TestClientSender(current_app._get_current_object())
+    results, elapsed = replay(entries, sender, rate=rate, concurrency=concurrency)
+    summary = summarize(results, elapsed)
+
+    click.echo(
+        f"{summary['requests']} requests in {elapsed:.2f}s ({summary['rps']:.1f} req/s), "
+        f"{summary['errors']} errors, {skipped} log lines skipped"
+    )
+    click.echo(f"{'endpoint':<32} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for endpoint, stats in summary["endpoints"].items():
+        statuses = " ".join(f"{status}:{count}" for status, count in stats["statuses"].items())
+        click.echo(
+            f"{endpoint:<32} {stats['requests']:>7} {stats['p50_ms']:>8.2f} "
+            f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}  {statuses}"
+        )
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(summary, file, indent=2)
+    if samples:
+        write_samples(samples, results)
@@ -0,0 +1,61 @@
+"""Read-replica routing for the board and card reads.
+
+With ``SQLALCHEMY_REPLICA_DATABASE_URI`` set, the replica is configured as
+the ``replica`` bind and ``GET``/``HEAD`` requests to the board and card
+routes run their SELECTs on it. Everything else (writes, flushes, other
+blueprints, CLI commands) uses the primary.
+
+Replicas lag behind, so a successful write sets a short-lived cookie and
+that client reads from the primary for ``REPLICA_STICKY_SECONDS``
+(default 5), which lets it see its own writes.
+"""
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "read_primary"
+REPLICA_BLUEPRINTS = ("boards", "cards")
+READ_METHODS = ("GET", "HEAD")
+DEFAULT_STICKY_SECONDS = 5
+
+
+class RoutingSession(Session):
+    """Sends SELECTs to the replica while the current request may read from it."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, "is_select", False) and reads_from_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_from_replica():
+    return (
+        has_request_context()
+        and "read_replica" in current_app.extensions
+        and request.method in READ_METHODS
+        and request.blueprint in REPLICA_BLUEPRINTS
+        and STICKY_COOKIE not in request.cookies
+    )
+
+
+def read_engine():
+    """The engine for reads outside ``db.session``, such as streamed responses."""
+    engines = current_app.extensions["sqlalchemy"].engines
+    return engines[REPLICA_BIND] if reads_from_replica() else engines[None]
+
+
+def init_read_replica(app):
+    if not app.config.get("SQLALCHEMY_REPLICA_DATABASE_URI"):
+        return None
+
+    sticky_seconds = app.config.get("REPLICA_STICKY_SECONDS")
+    sticky_seconds = DEFAULT_STICKY_SECONDS if sticky_seconds in (None, "") else int(sticky_seconds)
+    app.extensions["read_replica"] = sticky_seconds
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if request.method not in READ_METHODS + ("OPTIONS",) and response.status_code < 400:
+            response.set_cookie(STICKY_COOKIE, "1", max_age=sticky_seconds, httponly=True, samesite="Lax")
+        return response
+
+    return sticky_seconds
@@ -1,16 +1,97 @@
-from flask import Blueprint, request
+import gzip
+from datetime import datetime
+from flask import Blueprint, Response, abort, current_app, make_response, request
 from ..models.board import Board
 from ..models.card import Card
 from ..db import db
-from .route_utilities import validate_model, create_model, create_no_content_response
+from ..cache import cached_payload, coalesced_response, invalidate_board, board_key, board_cards_key
+from ..events import publish_board_event, create_event_stream_response
+from ..search import escape_like
+from ..snapshots import import_snapshot, stream_snapshot
+from .route_utilities import (
+    validate_model,
+    validate_model_id,
+    update_model,
+    delete_model,
+    abort_not_found,
+    create_model,
+    create_no_content_response,
+    get_page_params,
+    paginate_query,
+    create_page_response,
+    wants_stream,
+    create_stream_response,
+    get_sort_cursor,
+    SortCursors,
+    NDJSON_MIMETYPE,
+    conditional_get,
+    get_if_match_version,
+    validators_from_row,
+)
 
 boards_bp = Blueprint("boards", __name__, url_prefix="/boards")
 
+MAX_BULK_CARDS = 1000
+CARD_SORT_COLUMNS = {
+    "likes": Card.likes,
+    "created_at": Card.created_at,
+    "updated_at": Card.updated_at,
+}
+
+def get_boards_validators():
+    # No Last-Modified: a deleted board (or one filtered out) takes its
+    # updated_at out of the max, so the list would look older than before
+    row = db.session.execute(Board.select_list_validators(*get_board_filters())).one()
+    return validators_from_row(row, last_modified=False)
+
+def get_board_version(board_id):
+    return db.session.scalar(db.select(Board.version).where(Board.id == board_id))
+
+def get_board_validators(board_id):
+    board_id = validate_model_id(Board, board_id)
+    row = db.session.execute(Board.select_validators(board_id)).first()
+    return validators_from_row(row)
+
+def get_board_filters():
+    # Owner pages walk ix_boards_owner_id, owner plus title prefix ix_boards_owner_title;
+    # created_after filters what they find
+    filters = []
+    owner = request.args.get("owner")
+    title_prefix = request.args.get("title_prefix")
+    created_after = request.args.get("created_after")
+
+    if owner is not None:
+        if not owner:
+            abort(make_response({"details": "Invalid data"}, 400))
+        filters.append(Board.owner == owner)
+
+    if title_prefix is not None:
+        if not title_prefix:
+            abort(make_response({"details": "Invalid data"}, 400))
+        # A literal pattern, so Postgres can turn it into an index range
+        filters.append(Board.title.like(escape_like(title_prefix) + "%", escape="\\"))
+
+    if created_after is not None:
+        try:
+            filters.append(Board.created_at > datetime.fromisoformat(created_after))
+        except ValueError:
+            abort(make_response({"details": "Invalid data"}, 400))
+
+    return filters
+
 @boards_bp.get("")
+@conditional_get(get_boards_validators)
 def get_all_boards():
-    boards = db.session.scalars(db.select(Board).order_by(Board.id)).all()
+    after_id, limit = get_page_params()
+    # The aggregates are board columns, so this never reads the cards table
+    query = paginate_query(db.select(Board).where(*get_board_filters()), Board.id, after_id, limit)
+
+    if wants_stream():
+        return create_stream_response(query, lambda row: row[0].to_dict_with_card_count(), limit)
+
+    boards = db.session.scalars(query)
     boards_response = [board.to_dict_with_card_count() for board in boards]
-    return boards_response, 200
+    return create_page_response(boards_response, limit)
 
 @boards_bp.post("")
 def create_board():
@@ -26,36 +107,139 @@ def create_board():
     return new_board.to_dict_with_card_count(), 201
 
 @boards_bp.get("/<board_id>")
+@conditional_get(get_board_validators, versioned=True)
 def get_one_board(board_id):
+    board_id = validate_model_id(Board, board_id)
+    key = board_key(board_id)
+    return coalesced_response(key, lambda: cached_payload(key, lambda: build_board_response(board_id)))
+
+def build_board_response(board_id):
     board = validate_model(Board, board_id)
-    return board.to_dict(), 200
+
+    # Serialize cards straight from result rows instead of lazy-loading Card objects
+    query = Card.select_payloads().where(Card.board_id == board.id).order_by(Card.id)
+    cards = [Card.payload_from_row(row) for row in db.session.execute(query)]
+    return board.to_dict(cards=cards)
 
 @boards_bp.put("/<board_id>")
 def update_board(board_id):
-    board = validate_model(Board, board_id)
+    board_id = validate_model_id(Board, board_id)
     request_body = request.get_json()
-    
-    board.title = request_body.get("title", board.title)
-    board.owner = request_body.get("owner", board.owner)
-    
+    values = {key: request_body[key] for key in ("title", "owner") if key in request_body}
+    expected_version = get_if_match_version(get_board_version, board_id)
+
+    if values:
+        board = update_model(Board, board_id, values, expected_version)
+    else:
+        board = validate_model(Board, board_id)
+
+    board_response = board.to_dict_with_card_count()
     db.session.commit()
+    invalidate_board(board_id)
+    publish_board_event(board_id, "board.updated", board_response)
     
-    return board.to_dict_with_card_count(), 200
+    return board_response, 200
 
 @boards_bp.delete("/<board_id>")
 def delete_board(board_id):
-    board = validate_model(Board, board_id)
-    
-    db.session.delete(board)
+    board_id = validate_model_id(Board, board_id)
+
+    # Only the board row is marked; its cards are hidden with it and purged later
+    delete_model(Board, board_id)
     db.session.commit()
+    invalidate_board(board_id)
+    publish_board_event(board_id, "board.deleted", {"id": board_id})
     
     return create_no_content_response()
 
 @boards_bp.get("/<board_id>/cards")
+@conditional_get(get_board_validators, versioned=True)
 def get_cards_for_board(board_id):
+    board_id = validate_model_id(Board, board_id)
+    after_id, limit = get_page_params()
+    sort_column = get_card_sort_column()
+    after = get_sort_cursor(sort_column)
+    # Pages in sort order continue from ?after=<sort value>,<id> instead of ?after_id=
+    sort_cursors = SortCursors() if sort_column is not None and limit is not None else None
+
+    if wants_stream():
+        query = select_cards_for_board(board_id, after_id, limit, sort_column, after)
+        return create_stream_response(query, Card.payload_from_row, limit, sort_cursors=sort_cursors)
+
+    # Only the full, unpaginated list in id order is cached and coalesced
+    if limit is None and sort_column is None:
+        key = board_cards_key(board_id)
+        return coalesced_response(key, lambda: cached_payload(key, lambda: build_cards_response(board_id)))
+
+    if sort_cursors is not None:
+        serialize = sort_cursors.wrap(Card.payload_from_row)
+        rows = db.session.execute(select_cards_for_board(board_id, after_id, limit, sort_column, after))
+        cards_response = [serialize(row) for row in rows]
+        return create_page_response(cards_response, limit, sort_cursors.get_cursor, "after")
+
+    cards_response = build_cards_response(board_id, after_id, limit, sort_column)
+
+    return create_page_response(cards_response, limit)
+
+def get_card_sort_column():
+    sort = request.args.get("sort")
+    if sort is None:
+        return None
+    if sort not in CARD_SORT_COLUMNS:
+        response = {"details": "Invalid data"}
+        abort(make_response(response, 400))
+    return CARD_SORT_COLUMNS[sort]
+
+def select_cards_for_board(board_id, after_id=None, limit=None, sort_column=None, after=None):
+    board = validate_model(Board, board_id)
+    query = Card.select_payloads().where(Card.board_id == board.id)
+    return paginate_query(query, Card.id, after_id, limit, sort_column, after)
+
+def build_cards_response(board_id, after_id=None, limit=None, sort_column=None):
+    rows = db.session.execute(select_cards_for_board(board_id, after_id, limit, sort_column))
+    return [Card.payload_from_row(row) for row in rows]
+
+@boards_bp.get("/export")
+def export_boards():
+    return create_snapshot_response()
+
+@boards_bp.get("/<board_id>/export")
+def export_board(board_id):
     board = validate_model(Board, board_id)
-    cards_response = [card.to_dict() for card in board.cards]
-    return cards_response, 200
+    return create_snapshot_response(board.id)
+
+def create_snapshot_response(board_id=None):
+    compress = request.args.get("gzip") == "1"
+    filename = "boards.ndjson" if board_id is None else f"board-{board_id}.ndjson"
+
+    if compress:
+        response = Response(stream_snapshot(board_id, compress=True), mimetype="application/gzip")
+        filename += ".gz"
+    else:
+        response = Response(stream_snapshot(board_id), mimetype=NDJSON_MIMETYPE)
+
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+@boards_bp.post("/import")
+def import_boards():
+    # Read the upload line by line instead of loading the whole body
+    stream = request.stream
+    if request.content_encoding == "gzip":
+        stream = gzip.GzipFile(fileobj=stream)
+
+    try:
+        board_count, card_count = import_snapshot(stream)
+    except (ValueError, OSError, EOFError):
+        return {"details": "Invalid data"}, 400
+
+    current_app.extensions["leaderboard"].reset()
+    return {"boards": board_count, "cards": card_count}, 201
+
+@boards_bp.get("/<board_id>/events")
+def stream_board_events(board_id):
+    board = validate_model(Board, board_id)
+    return create_event_stream_response(board.id)
 
 @boards_bp.post("/<board_id>/cards")
 def create_card_for_board(board_id):
@@ -64,7 +248,7 @@ def create_card_for_board(board_id):
     
     try:
         message = request_body.get("message", "")
-        if not message or len(message) > 40:
+        if not Card.is_valid_message(message):
             return {"details": "Invalid data"}, 400
         
         request_body["board_id"] = board.id
@@ -74,5 +258,66 @@ def create_card_for_board(board_id):
     
     db.session.add(new_card)
     db.session.commit()
+    invalidate_board(board.id)
+
+    card_response = new_card.to_dict()
+    publish_board_event(board.id, "card.created", card_response)
     
-    return new_card.to_dict(), 201
\ No newline at end of file
+    return card_response, 201
+
+@boards_bp.post("/<board_id>/cards/bulk")
+def create_cards_for_board_bulk(board_id):
+    board = validate_model(Board, board_id)
+    request_body = request.get_json()
+
+    messages = request_body.get("messages") if isinstance(request_body, dict) else None
+    if not isinstance(messages, list) or not 0 < len(messages) <= MAX_BULK_CARDS:
+        return {"details": "Invalid data"}, 400
+    if not all(Card.is_valid_message(message) for message in messages):
+        return {"details": "Invalid data"}, 400
+
+    # One INSERT ... RETURNING round trip for the whole batch
+    card_rows = [{"message": message, "likes": 0, "board_id": board.id} for message in messages]
+    query = db.insert(Card).returning(Card, sort_by_parameter_order=True)
+    new_cards = db.session.scalars(query, card_rows).all()
+
+    cards_response = [card.to_dict() for card in new_cards]
+    db.session.commit()
+    invalidate_board(board.id)
+
+    # One event for the batch, so subscribers' queues do not overflow
+    publish_board_event(board.id, "cards.created", cards_response)
+
+    return cards_response, 201
+
+@boards_bp.delete("/<board_id>/cards/bulk")
+def delete_cards_for_board_bulk(board_id):
+    board = validate_model(Board, board_id)
+    request_body = request.get_json()
+
+    card_ids = request_body.get("ids") if isinstance(request_body, dict) else None
+    if not isinstance(card_ids, list) or not 0 < len(card_ids) <= MAX_BULK_CARDS:
+        return {"details": "Invalid data"}, 400
+    if not all(isinstance(card_id, int) and not isinstance(card_id, bool) for card_id in card_ids):
+        return {"details": "Invalid data"}, 400
+
+    query = (
+        db.update(Card)
+        .where(Card.board_id == board.id, Card.id.in_(card_ids))
+        .values(deleted_at=db.func.now())
+        .returning(Card.id)
+    )
+    deleted_ids = set(db.session.scalars(query))
+
+    # All or nothing: any unknown ID rolls back the whole delete
+    missing_ids = [card_id for card_id in card_ids if card_id not in deleted_ids]
+    if missing_ids:
+        db.session.rollback()
+        abort_not_found(Card, missing_ids[0])
+
+    db.session.commit()
+    invalidate_board(board.id)
+
+    publish_board_event(board.id, "cards.deleted", {"ids": card_ids, "board_id": board.id})
+
+    return create_no_content_response()
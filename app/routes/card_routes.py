@@ -1,46 +1,126 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from ..models.card import Card
 from ..db import db
-from .route_utilities import validate_model, create_model, create_no_content_response
+from ..cache import invalidate_board
+from ..events import publish_board_event
+from ..leaderboard import LEADERBOARD_MODES, get_leaderboard
+from ..rate_limit import rate_limit
+from .route_utilities import (
+    validate_model,
+    validate_model_id,
+    update_model,
+    delete_model,
+    create_model,
+    create_no_content_response,
+    conditional_get,
+    get_if_match_version,
+    validators_from_row,
+)
 
 cards_bp = Blueprint("cards", __name__, url_prefix="/cards")
 
+DEFAULT_TOP_LIMIT = 10
+MAX_TOP_LIMIT = 100
+
+def get_card_version(card_id):
+    return db.session.scalar(db.select(Card.version).where(Card.id == card_id))
+
+def get_card_validators(card_id):
+    card_id = validate_model_id(Card, card_id)
+    row = db.session.execute(Card.select_validators(card_id)).first()
+    return validators_from_row(row)
+
+@cards_bp.get("/top")
+def get_top_cards():
+    mode = request.args.get("mode", "likes")
+    try:
+        limit = int(request.args.get("limit", DEFAULT_TOP_LIMIT))
+    except ValueError:
+        limit = -1
+
+    if mode not in LEADERBOARD_MODES or not 1 <= limit <= MAX_TOP_LIMIT:
+        return {"details": "Invalid data"}, 400
+
+    ranked = get_leaderboard().top(mode, limit)
+
+    # The ranking only holds IDs and scores; fetch the payloads in one query
+    card_ids = [card_id for card_id, _ in ranked]
+    rows = db.session.execute(Card.select_payloads().where(Card.id.in_(card_ids)))
+    payloads = {row.id: Card.payload_from_row(row) for row in rows}
+
+    return [
+        {**payloads[card_id], "score": score}
+        for card_id, score in ranked
+        if card_id in payloads
+    ], 200
+
 @cards_bp.get("/<card_id>")
+@conditional_get(get_card_validators, versioned=True)
 def get_one_card(card_id):
     card = validate_model(Card, card_id)
     return card.to_dict(), 200
 
 @cards_bp.put("/<card_id>")
+@rate_limit("card_update", capacity=10, per_second=1)
 def update_card(card_id):
-    card = validate_model(Card, card_id)
+    card_id = validate_model_id(Card, card_id)
     request_body = request.get_json()
+    values = {}
     
     new_message = request_body.get("message")
     if new_message is not None:
-        if not new_message or len(new_message) > 40:
+        if not Card.is_valid_message(new_message):
             return {"details": "Invalid data"}, 400
-        card.message = new_message
-    
-    card.likes = request_body.get("likes", card.likes)
+        values["message"] = new_message
     
+    if "likes" in request_body:
+        values["likes"] = request_body["likes"]
+
+    expected_version = get_if_match_version(get_card_version, card_id)
+    if values:
+        card = update_model(Card, card_id, values, expected_version)
+    else:
+        card = validate_model(Card, card_id)
+
+    card_response = card.to_dict()
     db.session.commit()
+    invalidate_board(card_response["board_id"])
+    publish_board_event(card_response["board_id"], "card.updated", card_response)
     
-    return card.to_dict(), 200
+    return card_response, 200
 
 @cards_bp.patch("/<card_id>/like")
+@rate_limit("card_like", capacity=10, per_second=2)
 def like_card(card_id):
-    card = validate_model(Card, card_id)
-    
-    card.likes += 1
+    like_buffer = current_app.extensions.get("like_buffer")
+    if like_buffer is not None:
+        return like_card_write_behind(like_buffer, card_id)
+
+    # Increment in the database so concurrent likes are never lost
+    card = update_model(Card, card_id, {"likes": Card.likes + 1})
+
+    card_response = card.to_dict()
     db.session.commit()
-    
-    return card.to_dict(), 200
+    invalidate_board(card_response["board_id"])
+    publish_board_event(card_response["board_id"], "card.liked", card_response)
+
+    return card_response, 200
+
+def like_card_write_behind(like_buffer, card_id):
+    card = validate_model(Card, card_id)
+
+    card_response = card.to_dict()
+    card_response["likes"] += like_buffer.add(card.id)
+    invalidate_board(card.board_id)
+    publish_board_event(card.board_id, "card.liked", card_response)
+
+    return card_response, 200
 
 @cards_bp.delete("/<card_id>")
 def delete_card(card_id):
-    card = validate_model(Card, card_id)
-    
-    db.session.delete(card)
+    card_id, board_id = delete_model(Card, card_id, returning=[Card.board_id])
     db.session.commit()
+    invalidate_board(board_id)
+    publish_board_event(board_id, "card.deleted", {"id": card_id, "board_id": board_id})
     
-    return create_no_content_response()
\ No newline at end of file
+    return create_no_content_response()
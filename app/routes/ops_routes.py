@@ -0,0 +1,26 @@
+from flask import Blueprint, Response, current_app
+
+ops_bp = Blueprint("ops", __name__)
+
+@ops_bp.get("/cache/stats")
+def get_cache_stats():
+    cache = current_app.extensions.get("response_cache")
+    coalesced = current_app.extensions["request_coalescer"].coalesced
+    if cache is None:
+        return {"enabled": False, "hits": 0, "misses": 0, "coalesced": coalesced}, 200
+    return {"enabled": True, **cache.stats(), "coalesced": coalesced}, 200
+
+@ops_bp.get("/metrics")
+def get_metrics():
+    extra_counters = []
+    cache = current_app.extensions.get("response_cache")
+    if cache is not None:
+        stats = cache.stats()
+        extra_counters.append(("response_cache_hits_total", "Response cache hits", stats["hits"]))
+        extra_counters.append(("response_cache_misses_total", "Response cache misses", stats["misses"]))
+
+    coalesced = current_app.extensions["request_coalescer"].coalesced
+    extra_counters.append(("coalesced_requests_total", "Requests that shared another request's response", coalesced))
+
+    body = current_app.extensions["metrics"].render(extra_counters)
+    return Response(body, mimetype="text/plain; version=0.0.4")
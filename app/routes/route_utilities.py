@@ -1,22 +1,91 @@
-from flask import abort, make_response
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import Response, abort, current_app, g, make_response, request, url_for
+from sqlalchemy import String, tuple_, type_coerce
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
 from ..db import db
+from ..replica import read_engine
 
-def validate_model(cls, model_id):
-    try:
-        model_id = int(model_id)
-    except:
-        response = {"message": f"{cls.__name__} {model_id} invalid"}
-        abort(make_response(response , 400))
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+STREAM_BATCH_SIZE = 500
+NDJSON_MIMETYPE = "application/x-ndjson"
+# Label of the sort column in sorted page queries, see paginate_query
+SORT_VALUE = "sort_value"
 
-    query = db.select(cls).where(cls.id == model_id)
-    model = db.session.scalar(query)
+def validate_model(cls, model_id, options=()):
+    model_id = validate_model_id(cls, model_id)
+
+    # session.get skips the SELECT when the model is already in the identity map
+    model = db.session.get(cls, model_id, options=options)
     
     if not model:
-        response = {"message": f"{cls.__name__} {model_id} not found"}
-        abort(make_response(response, 404))
+        abort_not_found(cls, model_id)
     
     return model
 
+def update_model(cls, model_id, values, expected_version=None):
+    model_id = validate_model_id(cls, model_id)
+
+    # One UPDATE ... RETURNING instead of a SELECT followed by an UPDATE.
+    # UPDATE statements skip the mapper's version check, so bump it here
+    query = (
+        db.update(cls)
+        .where(cls.id == model_id)
+        .values(**values, version=cls.version + 1)
+        .returning(cls)
+    )
+    if expected_version is not None:
+        query = query.where(cls.version == expected_version)
+    model = db.session.scalar(query)
+
+    if model is None:
+        if expected_version is not None:
+            # It existed when If-Match was checked, so another request got there first
+            abort_conflict()
+        abort_not_found(cls, model_id)
+
+    return model
+
+def delete_model(cls, model_id, returning=()):
+    model_id = validate_model_id(cls, model_id)
+
+    # Soft delete: one UPDATE, the rows are purged later (see app/soft_delete.py)
+    query = (
+        db.update(cls)
+        .where(cls.id == model_id)
+        .values(deleted_at=db.func.now())
+        .returning(cls.id, *returning)
+    )
+    deleted = db.session.execute(query).first()
+
+    if deleted is None:
+        abort_not_found(cls, model_id)
+
+    return deleted
+
+def validate_model_id(cls, model_id):
+    try:
+        return int(model_id)
+    except:
+        response = {"message": f"{cls.__name__} {model_id} invalid"}
+        abort(make_response(response , 400))
+
+def abort_not_found(cls, model_id):
+    response = {"message": f"{cls.__name__} {model_id} not found"}
+    abort(make_response(response, 404))
+
+def abort_conflict():
+    response = {"details": "Conflict"}
+    abort(make_response(response, 409))
+
+def handle_stale_data(error):
+    # A flush's version check failed: another request changed the row first
+    db.session.rollback()
+    return {"details": "Conflict"}, 409
+
 
 def create_model(cls, model_data):
     try:
@@ -31,17 +100,230 @@ def create_model(cls, model_data):
 
     return new_model.to_dict(), 201
 
-def get_models_with_filters(cls, filters=None):
-    query = db.select(cls)
-    
-    if filters:
-        for attribute, value in filters.items():
-            if hasattr(cls, attribute):
-                query = query.where(getattr(cls, attribute).ilike(f"%{value}%"))
-
-    models = db.session.scalars(query.order_by(cls.id))
-    models_response = [model.to_dict() for model in models]
-    return models_response
-
 def create_no_content_response():
     return make_response("", 204)
+
+def get_page_params():
+    try:
+        after_id = _get_int_arg("after_id")
+        limit = _get_int_arg("limit")
+    except ValueError:
+        after_id = limit = -1
+
+    if (after_id is not None and after_id < 0) or (limit is not None and not 1 <= limit <= MAX_PAGE_LIMIT):
+        response = {"details": "Invalid data"}
+        abort(make_response(response, 400))
+
+    if (after_id is not None or "after" in request.args) and limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+
+    return after_id, limit
+
+def _get_int_arg(name):
+    value = request.args.get(name)
+    return None if value is None else int(value)
+
+def get_sort_cursor(sort_column):
+    """Parse the ``after=<sort value>,<id>`` cursor of a sorted page."""
+    cursor = request.args.get("after")
+    if cursor is None:
+        return None
+
+    sort_value, _, cursor_id = cursor.rpartition(",")
+    try:
+        if sort_column is None or "after_id" in request.args:
+            raise ValueError(cursor)
+        if _is_timestamp(sort_column):
+            # Kept as text, see paginate_query
+            datetime.fromisoformat(sort_value)
+            return sort_value, int(cursor_id)
+        return int(sort_value), int(cursor_id)
+    except ValueError:
+        response = {"details": "Invalid data"}
+        abort(make_response(response, 400))
+
+def _is_timestamp(column):
+    return column.type.python_type is datetime
+
+def paginate_query(query, id_column, after_id=None, limit=None, sort_column=None, after=None):
+    if sort_column is None:
+        if after_id is not None:
+            query = query.where(id_column > after_id)
+        query = query.order_by(id_column)
+    else:
+        # Highest first, keyset on (sort_column, id). Paged rows carry their
+        # sort value so the cursor holds both (see SortCursors), and a later
+        # like or delete of the cursor row cannot move the next page
+        # Timestamps travel as the database's own text: SQLite compares them as
+        # strings, and a datetime bound back in another format would not match
+        cursor_type = String if _is_timestamp(sort_column) else sort_column.type
+        if limit is not None:
+            query = query.add_columns(type_coerce(sort_column, cursor_type).label(SORT_VALUE))
+        if after is not None:
+            sort_value, cursor_id = after
+            query = query.where(tuple_(sort_column, id_column) < tuple_(type_coerce(sort_value, cursor_type), cursor_id))
+        query = query.order_by(sort_column.desc(), id_column.desc())
+
+    if limit is not None:
+        # Fetch one extra row so we know whether there is a next page
+        query = query.limit(limit + 1)
+
+    return query
+
+def create_page_response(items, limit, get_id=lambda item: item["id"], cursor_arg="after_id"):
+    has_next = limit is not None and len(items) > limit
+    if has_next:
+        items = items[:limit]
+
+    response = make_response(items, 200)
+
+    if has_next:
+        set_next_page_headers(response, get_id(items[-1]), limit, cursor_arg)
+
+    return response
+
+def set_next_page_headers(response, next_cursor, limit, cursor_arg="after_id"):
+    # Keep the other query arguments (such as sort) on the next page's URL
+    query_args = {name: value for name, value in request.args.items() if name not in ("after_id", "after", "limit")}
+    next_url = url_for(request.endpoint, **request.view_args, **{cursor_arg: next_cursor}, limit=limit, **query_args)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = str(next_cursor)
+
+def wants_stream():
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+def create_stream_response(query, serialize, limit=None, batch_size=STREAM_BATCH_SIZE, sort_cursors=None):
+    if sort_cursors is not None:
+        return create_stream_page_response(query, sort_cursors.wrap(serialize), limit, sort_cursors.get_cursor, "after")
+    if limit is not None:
+        return create_stream_page_response(query, serialize, limit)
+
+    # Use a dedicated session so the stream outlives the request's scoped session
+    engine = read_engine()
+    json = current_app.json
+
+    def generate():
+        with Session(engine) as session:
+            rows = session.execute(query.execution_options(yield_per=batch_size))
+            for row in rows:
+                yield json.dumps(serialize(row)) + "\n"
+
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
+def create_stream_page_response(query, serialize, limit, get_id=lambda item: item["id"], cursor_arg="after_id"):
+    # A page is at most MAX_PAGE_LIMIT + 1 rows, so read it up front to know
+    # whether there is a next page before the headers go out
+    items = [serialize(row) for row in db.session.execute(query)]
+    has_next = len(items) > limit
+    if has_next:
+        items = items[:limit]
+
+    json = current_app.json
+    response = Response("".join(json.dumps(item) + "\n" for item in items), mimetype=NDJSON_MIMETYPE)
+
+    if has_next:
+        set_next_page_headers(response, get_id(items[-1]), limit, cursor_arg)
+
+    return response
+
+class SortCursors:
+    """Takes the sort value off the rows of a sorted page for its cursor.
+
+    ``wrap`` returns a serializer that drops the ``SORT_VALUE`` column
+    paginate_query adds to paged queries, and ``get_cursor`` gives the
+    ``<sort value>,<id>`` cursor of a serialized item.
+    """
+
+    def __init__(self):
+        self._cursors = {}
+
+    def wrap(self, serialize):
+        def serialize_sorted(row):
+            item = serialize(row)
+            sort_value = item.pop(SORT_VALUE)
+            if isinstance(sort_value, datetime):
+                sort_value = sort_value.isoformat()
+            self._cursors[item["id"]] = f"{sort_value},{item['id']}"
+            return item
+
+        return serialize_sorted
+
+    def get_cursor(self, item):
+        return self._cursors[item["id"]]
+
+def conditional_get(get_validators, versioned=False):
+    """Answer If-None-Match/If-Modified-Since with 304 before the view runs.
+
+    ``get_validators`` receives the view arguments and returns a tuple of
+    values that change whenever the payload does plus the last modified
+    time (None to send no Last-Modified), or None when the resource does not
+    exist. With ``versioned`` the
+    first value is the model's version, which prefixes the ETag so that
+    ``If-Match`` on updates can compare versions (see get_if_match_version).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validators = get_validators(*args, **kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            parts, last_modified = validators
+            etag = make_etag(request.full_path, parts, parts[0] if versioned else None)
+            # Cached and coalesced payloads are tied to it (see app/cache.py)
+            g.response_etag = etag
+
+            if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            else:
+                response = make_response("", 304)
+
+            response.set_etag(etag)
+            # Assigning None would make Werkzeug send the current time
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
+
+def get_if_match_version(get_version, *args):
+    """Check If-Match against the model's version before an update.
+
+    Only the version prefix of the listed ETags is compared, so changes
+    the ETag covers but the update does not (such as likes on a board's
+    cards) are no conflict. Returns None without an ``If-Match`` header
+    (or when the resource does not exist, so the update reports 404),
+    aborts with ``412`` when no listed ETag has the current version, and
+    otherwise returns that version. Updating against it turns a change
+    made since the check into a ``409`` without locking the row.
+    """
+    if "If-Match" not in request.headers:
+        return None
+
+    version = get_version(*args)
+    if version is None:
+        return None
+
+    listed_versions = {etag.partition("-")[0] for etag in request.if_match.as_set()}
+    if not request.if_match.star_tag and str(version) not in listed_versions:
+        abort(make_response({"details": "Precondition failed"}, 412))
+
+    return version
+
+def validators_from_row(row, last_modified=True):
+    if row is None:
+        return None
+
+    timestamps = [value for value in row if isinstance(value, datetime)]
+    return tuple(row), max(timestamps, default=None) if last_modified else None
+
+def make_etag(full_path, parts, version=None):
+    digest = hashlib.sha1(repr((full_path, parts)).encode()).hexdigest()
+    return digest if version is None else f"{version}-{digest}"
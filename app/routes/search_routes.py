@@ -0,0 +1,33 @@
+from flask import Blueprint, abort, make_response, request
+from ..search import search_boards, search_cards
+
+search_bp = Blueprint("search", __name__, url_prefix="/search")
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+@search_bp.get("")
+def search():
+    search_text = request.args.get("q", "").strip()
+    if not search_text:
+        return {"details": "Invalid data"}, 400
+
+    limit, offset = get_search_page_params()
+
+    return {
+        "boards": search_boards(search_text, limit, offset),
+        "cards": search_cards(search_text, limit, offset),
+    }, 200
+
+def get_search_page_params():
+    try:
+        limit = int(request.args.get("limit", DEFAULT_SEARCH_LIMIT))
+        offset = int(request.args.get("offset", 0))
+    except ValueError:
+        limit = offset = -1
+
+    if not 1 <= limit <= MAX_SEARCH_LIMIT or offset < 0:
+        response = {"details": "Invalid data"}
+        abort(make_response(response, 400))
+
+    return limit, offset
@@ -0,0 +1,46 @@
+"""Board and card search.
+
+On Postgres the ``search_vector`` columns are stored ``tsvector`` columns
+generated from the searchable text and backed by GIN indexes (created by
+migration ``7c2d9a4e1f53`` and by ``create_all``), so results are ranked
+with ``ts_rank``. Other databases, such as SQLite in local tests, fall back
+to matching every search term with ``ilike`` and order by id.
+"""
+from sqlalchemy import literal_column, or_
+from .db import db
+from .models.board import Board
+from .models.card import Card
+
+SEARCH_CONFIG = "english"
+
+
+def search_boards(search_text, limit, offset):
+    query = db.select(Board.id, Board.title, Board.owner)
+    query = _apply_search(query, "boards", search_text, Board.id, [Board.title, Board.owner], _dialect_name())
+    return [row._asdict() for row in db.session.execute(query.limit(limit).offset(offset))]
+
+
+def search_cards(search_text, limit, offset):
+    query = _apply_search(Card.select_payloads(), "cards", search_text, Card.id, [Card.message], _dialect_name())
+    return [Card.payload_from_row(row) for row in db.session.execute(query.limit(limit).offset(offset))]
+
+
+def _dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+def _apply_search(query, table_name, search_text, id_column, text_columns, dialect_name):
+    if dialect_name == "postgresql":
+        search_vector = literal_column(f"{table_name}.search_vector")
+        ts_query = db.func.websearch_to_tsquery(SEARCH_CONFIG, search_text)
+        rank = db.func.ts_rank(search_vector, ts_query)
+        return query.where(search_vector.op("@@")(ts_query)).order_by(rank.desc(), id_column)
+
+    for term in search_text.split():
+        pattern = f"%{escape_like(term)}%"
+        query = query.where(or_(*(column.ilike(pattern, escape="\\") for column in text_columns)))
+    return query.order_by(id_column)
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
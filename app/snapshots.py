@@ -0,0 +1,270 @@
+"""Board snapshots: export and import boards with their cards as NDJSON.
+
+A snapshot has one JSON object per line, every board first and then every
+card ordered by board::
+
+    {"type": "board", "id": 1, "title": "...", "owner": "...", "created_at": "...", "updated_at": "..."}
+    {"type": "card", "id": 7, "board_id": 1, "message": "...", "likes": 3, "created_at": "...", "updated_at": "..."}
+
+Exports stream rows with ``yield_per`` and imports insert them in batched
+``executemany`` statements on the tables, so memory does not grow with the
+number of cards (imports keep one ``old id -> new id`` entry per board).
+Snapshots can be gzip-compressed (``.gz`` files, ``?gzip=1``, or
+``Content-Encoding: gzip`` on upload).
+"""
+import gzip
+import json
+import zlib
+from datetime import datetime, timezone
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .db import db
+from .models.board import Board
+from .models.card import Card
+from .replica import read_engine
+
+SNAPSHOT_BATCH_SIZE = 1000
+
+boards_table = Board.__table__
+cards_table = Card.__table__
+
+
+def iter_snapshot(session, board_id=None, batch_size=SNAPSHOT_BATCH_SIZE):
+    """Yield the snapshot lines of one board, or of every board."""
+    boards = db.select(Board.id, Board.title, Board.owner, Board.created_at, Board.updated_at).order_by(Board.id)
+    cards = db.select(
+        Card.id, Card.board_id, Card.message, Card.likes, Card.created_at, Card.updated_at
+    ).order_by(Card.board_id, Card.id)
+
+    if board_id is not None:
+        boards = boards.where(Board.id == board_id)
+        cards = cards.where(Card.board_id == board_id)
+
+    for record_type, query in (("board", boards), ("card", cards)):
+        for row in session.execute(query.execution_options(yield_per=batch_size)):
+            yield encode_record(record_type, row._asdict())
+
+
+def encode_record(record_type, values):
+    record = {"type": record_type}
+    for name, value in values.items():
+        record[name] = value.isoformat() if isinstance(value, datetime) else value
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def gzip_lines(lines, chunk_lines=SNAPSHOT_BATCH_SIZE):
+    # wbits=31 writes a gzip header, so the output is a regular .gz file
+    compressor = zlib.compressobj(wbits=31)
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            yield compressor.compress("".join(chunk).encode())
+            chunk = []
+    yield compressor.compress("".join(chunk).encode()) + compressor.flush()
+
+
+def stream_snapshot(board_id=None, compress=False):
+    """Generator over the snapshot, reading through its own session.
+
+    The session is separate from the request's so the rows keep streaming
+    after the view returns.
+    """
+    engine = read_engine()
+
+    def generate():
+        with Session(engine) as session:
+            lines = iter_snapshot(session, board_id)
+            yield from gzip_lines(lines) if compress else lines
+
+    return generate()
+
+
+class SnapshotImporter:
+    """Inserts snapshot records in batches of ``batch_size`` rows.
+
+    By default boards get new ids and cards follow their board's new id, so
+    a snapshot can be loaded next to existing data. With ``keep_ids`` the
+    snapshot's ids are inserted as they are (for restoring into an empty
+    database) and Postgres sequences are moved past them.
+    """
+
+    def __init__(self, session, keep_ids=False, batch_size=SNAPSHOT_BATCH_SIZE):
+        self.session = session
+        self.keep_ids = keep_ids
+        self.batch_size = batch_size
+        self.board_count = 0
+        self.card_count = 0
+        self._board_ids = {}
+        self._boards = []
+        self._snapshot_board_ids = []
+        self._cards = []
+
+    def add(self, record):
+        record_type = record.get("type")
+        if record_type == "board":
+            self._add_board(record)
+        elif record_type == "card":
+            self._add_card(record)
+        else:
+            raise ValueError(f"unknown record type {record_type!r}")
+
+    def finish(self):
+        self._flush_boards()
+        self._flush_cards()
+        if self.keep_ids and self.session.get_bind().dialect.name == "postgresql":
+            for table in ("boards", "cards"):
+                self.session.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 1)) FROM {table}"
+                ))
+        return self.board_count, self.card_count
+
+    def _add_board(self, record):
+        row = {
+            "title": _require_text(record, "title"),
+            "owner": _require_text(record, "owner"),
+            "created_at": _timestamp(record.get("created_at")),
+            "updated_at": _timestamp(record.get("updated_at")),
+        }
+        if self.keep_ids:
+            row["id"] = _require_int(record, "id")
+        self._boards.append(row)
+        self._snapshot_board_ids.append(_require_int(record, "id"))
+
+        if len(self._boards) >= self.batch_size:
+            self._flush_boards()
+
+    def _add_card(self, record):
+        board_id = _require_int(record, "board_id")
+        if board_id not in self._board_ids:
+            # The card's board may still be waiting in the current batch
+            self._flush_boards()
+        if board_id not in self._board_ids:
+            raise ValueError(f"card {record.get('id')} references board {board_id}, which is not in the snapshot")
+
+        message = _require_text(record, "message")
+        if not Card.is_valid_message(message):
+            raise ValueError(f"card {record.get('id')} has an invalid message")
+
+        row = {
+            "board_id": self._board_ids[board_id],
+            "message": message,
+            "likes": record.get("likes", 0),
+            "created_at": _timestamp(record.get("created_at")),
+            "updated_at": _timestamp(record.get("updated_at")),
+        }
+        if not isinstance(row["likes"], int):
+            raise ValueError(f"card {record.get('id')} has invalid likes")
+        if self.keep_ids:
+            row["id"] = _require_int(record, "id")
+        self._cards.append(row)
+
+        if len(self._cards) >= self.batch_size:
+            self._flush_cards()
+
+    def _flush_boards(self):
+        if not self._boards:
+            return
+
+        if self.keep_ids:
+            self.session.execute(db.insert(boards_table), self._boards)
+            new_ids = [row["id"] for row in self._boards]
+        else:
+            query = db.insert(boards_table).returning(boards_table.c.id, sort_by_parameter_order=True)
+            new_ids = self.session.scalars(query, self._boards).all()
+
+        self._board_ids.update(zip(self._snapshot_board_ids, new_ids))
+        self.board_count += len(self._boards)
+        self._boards, self._snapshot_board_ids = [], []
+
+    def _flush_cards(self):
+        if not self._cards:
+            return
+
+        self.session.execute(db.insert(cards_table), self._cards)
+        self.card_count += len(self._cards)
+        self._cards = []
+
+
+def import_snapshot(lines, keep_ids=False, batch_size=SNAPSHOT_BATCH_SIZE):
+    """Import snapshot lines in one transaction; returns (boards, cards) imported.
+
+    Raises ValueError for a malformed snapshot, after rolling back.
+    """
+    importer = SnapshotImporter(db.session, keep_ids, batch_size)
+    try:
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("snapshot lines must be JSON objects")
+            importer.add(record)
+        counts = importer.finish()
+    except Exception as error:
+        db.session.rollback()
+        if isinstance(error, (ValueError, KeyError, TypeError, IntegrityError)):
+            raise ValueError(str(error)) from error
+        raise
+
+    db.session.commit()
+    return counts
+
+
+def _require_text(record, name):
+    value = record[name]
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{record['type']} {record.get('id')} has an invalid {name}")
+    return value
+
+
+def _require_int(record, name):
+    value = record[name]
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"{record['type']} has an invalid {name}")
+    return value
+
+
+def _timestamp(value):
+    if value is None:
+        return datetime.now(timezone.utc)
+    return datetime.fromisoformat(value)
+
+
+def open_snapshot(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+@click.command("export-boards")
+@click.argument("path", type=click.Path(dir_okay=False))
+@click.option("--board-id", type=int, help="Export only this board (default: every board).")
+@with_appcontext
+def export_command(path, board_id):
+    """Write boards and their cards to an NDJSON snapshot (gzip if PATH ends in .gz)."""
+    lines = 0
+    with open_snapshot(path, "w") as file:
+        for line in stream_snapshot(board_id):
+            file.write(line)
+            lines += 1
+    click.echo(f"Wrote {lines} records to {path}")
+
+
+@click.command("import-boards")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--keep-ids", is_flag=True, help="Keep the snapshot's ids (restore into an empty database).")
+@click.option("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE, help="Rows per INSERT batch.")
+@with_appcontext
+def import_command(path, keep_ids, batch_size):
+    """Load an NDJSON snapshot written by export-boards."""
+    with open_snapshot(path, "r") as file:
+        try:
+            board_count, card_count = import_snapshot(file, keep_ids, batch_size)
+        except ValueError as error:
+            raise click.ClickException(f"invalid snapshot: {error}")
+
+    click.echo(f"Imported {board_count} boards and {card_count} cards")
@@ -0,0 +1,88 @@
+"""Soft deletes for boards and cards.
+
+Deleting a board or card only sets ``deleted_at``, one row update however
+many cards a board has. Every ORM query (selects, ``session.get``, lazy
+loads and ORM-enabled updates, from the Flask routes and the ASGI app
+alike) skips deleted boards, deleted cards and cards of deleted boards.
+``flask purge-deleted`` later removes the rows in batches.
+"""
+from datetime import datetime, timedelta, timezone
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session, with_loader_criteria
+from .db import db
+from .models.board import Board
+from .models.card import Card
+
+DEFAULT_RETENTION_SECONDS = 24 * 60 * 60
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+boards_table = Board.__table__
+cards_table = Card.__table__
+
+# Core columns, so the subquery is not itself filtered
+deleted_board_ids = db.select(boards_table.c.id).where(boards_table.c.deleted_at.is_not(None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def skip_deleted_rows(execute_state):
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(Board, Board.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(
+            Card,
+            Card.deleted_at.is_(None) & Card.board_id.not_in(deleted_board_ids),
+            include_aliases=True,
+        ),
+    )
+
+
+def purge_deleted(older_than=DEFAULT_RETENTION_SECONDS, batch_size=DEFAULT_PURGE_BATCH_SIZE):
+    """Hard-delete rows soft-deleted more than ``older_than`` seconds ago.
+
+    Works in batches of ``batch_size`` rows with a commit after each, so no
+    transaction holds many locks. Cards of purged boards go first, so
+    deleting the boards themselves cascades to nothing. Returns the number
+    of boards and cards removed.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than)
+    purged_board_ids = db.select(boards_table.c.id).where(boards_table.c.deleted_at < cutoff)
+
+    purged_cards = _delete_in_batches(
+        cards_table,
+        or_(cards_table.c.deleted_at < cutoff, cards_table.c.board_id.in_(purged_board_ids)),
+        batch_size,
+    )
+    purged_boards = _delete_in_batches(boards_table, boards_table.c.deleted_at < cutoff, batch_size)
+    return purged_boards, purged_cards
+
+
+def _delete_in_batches(table, condition, batch_size):
+    total = 0
+    while True:
+        batch = db.select(table.c.id).where(condition).limit(batch_size)
+        result = db.session.execute(db.delete(table).where(table.c.id.in_(batch)))
+        db.session.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+@click.command("purge-deleted")
+@click.option("--older-than", type=int, help="Seconds a row must have been deleted for (default SOFT_DELETE_RETENTION_SECONDS).")
+@click.option("--batch-size", type=int, default=DEFAULT_PURGE_BATCH_SIZE, help="Rows deleted per transaction.")
+@with_appcontext
+def purge_command(older_than, batch_size):
+    """Hard-delete soft-deleted boards and cards in batches."""
+    if older_than is None:
+        older_than = current_app.config.get("SOFT_DELETE_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS)
+
+    purged_boards, purged_cards = purge_deleted(older_than, batch_size)
+    click.echo(f"Purged {purged_boards} boards and {purged_cards} cards")
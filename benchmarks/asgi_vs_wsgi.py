@@ -0,0 +1,117 @@
+"""Load-test the sync (gunicorn) and async (uvicorn) serving modes side by side.
+
+Starts each server as a subprocess on the benchmark database, then runs
+``--concurrency`` keep-alive HTTP clients for ``--seconds`` against a mix of
+board reads and likes, and prints throughput and latency percentiles.
+Needs requirements-async.txt; use a Postgres BENCHMARK_DATABASE_URI for
+meaningful numbers.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi [--workers 2] [--concurrency 32] [--seconds 10]
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.db import db
+from .common import create_benchmark_app, percentile, reset_database, seed
+
+SERVERS = {
+    "sync (gunicorn)": [
+        "gunicorn", "-w", "{workers}", "-b", "127.0.0.1:{port}", "--log-level", "warning",
+        "app:create_app()",
+    ],
+    "async (uvicorn)": [
+        "uvicorn", "--factory", "app.asgi:create_asgi_app",
+        "--workers", "{workers}", "--port", "{port}", "--log-level", "warning",
+    ],
+}
+
+
+def wait_for_server(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/boards/1")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def run_load(port, concurrency, seconds, board_ids, like_ratio):
+    deadline = time.perf_counter() + seconds
+
+    def client_loop(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies, errors, count = [], 0, 0
+        while time.perf_counter() < deadline:
+            board_id = board_ids[(offset + count) % len(board_ids)]
+            if count % 100 < like_ratio * 100:
+                method, path = "PATCH", f"/cards/{board_id}/like"
+            else:
+                method, path = "GET", f"/boards/{board_id}"
+
+            start = time.perf_counter()
+            connection.request(method, path)
+            response = connection.getresponse()
+            response.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += response.status >= 400
+            count += 1
+        return latencies, errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(client_loop, range(concurrency)))
+
+    latencies = [latency for client_latencies, _ in results for latency in client_latencies]
+    errors = sum(error_count for _, error_count in results)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--like-ratio", type=float, default=0.1)
+    parser.add_argument("--boards", type=int, default=500)
+    parser.add_argument("--cards-per-board", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        reset_database()
+        board_ids = seed(args.boards, args.cards_per_board)
+        database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+        db.engine.dispose()
+
+    env = {**os.environ, "SQLALCHEMY_DATABASE_URI": database_uri}
+    print(f"{'mode':<18} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, command in SERVERS.items():
+        command = [part.format(workers=args.workers, port=args.port) for part in command]
+        server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=sys.stderr)
+        try:
+            wait_for_server(args.port)
+            latencies, errors = run_load(args.port, args.concurrency, args.seconds, board_ids, args.like_ratio)
+        finally:
+            server.terminate()
+            server.wait()
+
+        print(
+            f"{name:<18} {len(latencies) / args.seconds:>9.1f} {percentile(latencies, 50):>8.2f} "
+            f"{percentile(latencies, 95):>8.2f} {percentile(latencies, 99):>8.2f} {errors:>7}"
+        )
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Shared setup for the benchmark scripts.
+
+Benchmarks run against ``BENCHMARK_DATABASE_URI`` when it is set (point it
+at a throwaway Postgres database), otherwise against a temporary SQLite
+file. Every script drops and recreates the tables it uses.
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from app import create_app
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+
+WORDS = ["kind", "brave", "shine", "focus", "rest", "grow", "smile", "learn", "share", "thanks"]
+
+
+def create_benchmark_app(**config):
+    database_uri = os.environ.get("BENCHMARK_DATABASE_URI")
+    if not database_uri:
+        path = os.path.join(tempfile.gettempdir(), "inspiration_board_benchmark.db")
+        database_uri = f"sqlite:///{path}"
+
+    return create_app({"SQLALCHEMY_DATABASE_URI": database_uri, **config})
+
+
+def reset_database():
+    db.drop_all()
+    db.create_all()
+
+
+def seed(board_count, cards_per_board, batch_size=5000, seed_value=42):
+    """Insert boards and cards with executemany batches; returns the board ids."""
+    rng = random.Random(seed_value)
+
+    boards = [
+        {"title": f"Board {i} {rng.choice(WORDS)}", "owner": f"owner-{i % 50}"}
+        for i in range(board_count)
+    ]
+    db.session.execute(db.insert(Board), boards)
+    db.session.commit()
+    board_ids = db.session.scalars(db.select(Board.id).order_by(Board.id)).all()
+
+    batch = []
+    for board_id in board_ids:
+        for _ in range(cards_per_board):
+            message = " ".join(rng.choice(WORDS) for _ in range(3))
+            batch.append({"message": message, "likes": rng.randint(0, 100), "board_id": board_id})
+            if len(batch) >= batch_size:
+                db.session.execute(db.insert(Card), batch)
+                batch = []
+    if batch:
+        db.session.execute(db.insert(Card), batch)
+    db.session.commit()
+
+    return board_ids
+
+
+def time_call(func, repeat=20):
+    """Run func repeat times and return the median wall time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
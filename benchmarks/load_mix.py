@@ -0,0 +1,187 @@
+"""Replay a read/like/create request mix against create_app() and report per endpoint.
+
+Seeds ``--cards`` cards (``--cards-per-board`` per board, 1k to 1M is
+reasonable), then runs ``--threads`` test clients for ``--seconds``, each
+picking requests from the weighted mix below. Prints throughput, p50/p95/p99
+latency and mean SQL statements per request for every endpoint. Save a run
+with ``--output`` and pass it to a later run's ``--compare`` to see the
+change between commits.
+
+Usage:
+    python -m benchmarks.load_mix [--cards 100000] [--cards-per-board 50]
+        [--threads 4] [--seconds 10] [--output run.json] [--compare base.json]
+"""
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from app.db import db
+from app.models.card import Card
+from .common import WORDS, create_benchmark_app, percentile, reset_database, seed
+
+# (endpoint, method, weight)
+MIX = [
+    ("GET /boards/<id>", "GET", 30),
+    ("GET /boards/<id>/cards", "GET", 25),
+    ("GET /cards/<id>", "GET", 15),
+    ("GET /boards?limit=", "GET", 5),
+    ("GET /cards/top", "GET", 5),
+    ("PATCH /cards/<id>/like", "PATCH", 15),
+    ("POST /boards/<id>/cards", "POST", 5),
+]
+
+
+def build_request(endpoint, rng, board_ids, max_card_id):
+    board_id = rng.choice(board_ids)
+    card_id = rng.randint(1, max_card_id)
+
+    if endpoint == "GET /boards/<id>":
+        return f"/boards/{board_id}", None
+    if endpoint == "GET /boards/<id>/cards":
+        return f"/boards/{board_id}/cards", None
+    if endpoint == "GET /cards/<id>":
+        return f"/cards/{card_id}", None
+    if endpoint == "GET /boards?limit=":
+        return f"/boards?after_id={board_id}&limit=50", None
+    if endpoint == "GET /cards/top":
+        return "/cards/top?limit=20", None
+    if endpoint == "PATCH /cards/<id>/like":
+        return f"/cards/{card_id}/like", None
+    message = " ".join(rng.choice(WORDS) for _ in range(3))
+    return f"/boards/{board_id}/cards", {"message": message}
+
+
+def run_mix(app, threads, seconds, board_ids, max_card_id, seed_value=7):
+    endpoints = [endpoint for endpoint, _, _ in MIX]
+    methods = {endpoint: method for endpoint, method, _ in MIX}
+    weights = [weight for _, _, weight in MIX]
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client_loop(offset):
+        rng = random.Random(seed_value + offset)
+        client = app.test_client()
+        local = defaultdict(list)
+
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            path, body = build_request(endpoint, rng, board_ids, max_card_id)
+
+            start = time.perf_counter()
+            response = client.open(path, method=methods[endpoint], json=body)
+            elapsed = (time.perf_counter() - start) * 1000
+            response.close()
+
+            query_count = int(response.headers.get("X-Query-Count", 0))
+            local[endpoint].append((elapsed, query_count, response.status_code >= 400))
+
+        with lock:
+            for endpoint, values in local.items():
+                samples[endpoint].extend(values)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(client_loop, range(threads)))
+
+    return summarize(samples, seconds)
+
+
+def summarize(samples, seconds):
+    summary = {}
+    for endpoint, _, _ in MIX:
+        values = samples.get(endpoint, [])
+        latencies = [elapsed for elapsed, _, _ in values]
+        summary[endpoint] = {
+            "requests": len(values),
+            "rps": len(values) / seconds,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "sql_per_request": sum(count for _, count, _ in values) / len(values) if values else 0.0,
+            "errors": sum(error for _, _, error in values),
+        }
+    return summary
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def print_summary(summary, seconds, baseline=None):
+    header = f"{'endpoint':<26} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'SQL/req':>8} {'errors':>7}"
+    if baseline:
+        header += f" {'Δ p95':>8} {'Δ req/s':>8}"
+    print(header)
+
+    for endpoint, stats in summary.items():
+        line = (
+            f"{endpoint:<26} {stats['rps']:>9.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['sql_per_request']:>8.2f} {stats['errors']:>7}"
+        )
+        base = (baseline or {}).get(endpoint)
+        if base:
+            line += f" {relative_change(base['p95_ms'], stats['p95_ms']):>8} {relative_change(base['rps'], stats['rps']):>8}"
+        print(line)
+
+    total = sum(stats["requests"] for stats in summary.values())
+    print(f"total: {total} requests, {total / seconds:.1f} req/s")
+
+
+def relative_change(before, after):
+    if not before:
+        return "-"
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--cards-per-board", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    app = create_benchmark_app(QUERY_COUNT_HEADER=True)
+    with app.app_context():
+        reset_database()
+        board_ids = seed(max(1, args.cards // args.cards_per_board), args.cards_per_board)
+        max_card_id = db.session.scalar(db.select(db.func.max(Card.id)))
+        db.session.remove()
+
+    print(f"{len(board_ids)} boards, {max_card_id} cards, {args.threads} threads, {args.seconds:g}s")
+    summary = run_mix(app, args.threads, args.seconds, board_ids, max_card_id)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["endpoints"]
+    print_summary(summary, args.seconds, baseline)
+
+    if args.output:
+        result = {
+            "revision": git_revision(),
+            "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+            "cards": max_card_id,
+            "threads": args.threads,
+            "seconds": args.seconds,
+            "endpoints": summary,
+        }
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure read throughput for different worker / pool size combinations.
+
+Each worker is a separate process with its own app and connection pool,
+like a gunicorn worker, and runs ``--threads`` concurrent clients. Pool
+settings only apply to Postgres, so set BENCHMARK_DATABASE_URI.
+
+Usage:
+    python -m benchmarks.pool_throughput [--workers 1,2,4] [--pool-sizes 1,5,10]
+        [--threads 8] [--seconds 5] [--pgbouncer]
+"""
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.db import db
+from .common import create_benchmark_app, reset_database, seed
+
+
+def run_worker(pool_size, threads, seconds, pgbouncer, board_ids, results):
+    app = create_benchmark_app(
+        SQLALCHEMY_POOL_SIZE=pool_size,
+        SQLALCHEMY_MAX_OVERFLOW=0,
+        SQLALCHEMY_PGBOUNCER=pgbouncer,
+    )
+    deadline = time.perf_counter() + seconds
+
+    def client_loop(offset):
+        client = app.test_client()
+        completed = errors = 0
+        while time.perf_counter() < deadline:
+            board_id = board_ids[(offset + completed) % len(board_ids)]
+            response = client.get(f"/boards/{board_id}")
+            completed += 1
+            errors += response.status_code != 200
+        return completed, errors
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        counts = list(executor.map(client_loop, range(threads)))
+
+    results.put((sum(count for count, _ in counts), sum(errors for _, errors in counts)))
+
+
+def measure(workers, pool_size, threads, seconds, pgbouncer, board_ids):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(pool_size, threads, seconds, pgbouncer, board_ids, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    requests = sum(count for count, _ in totals)
+    errors = sum(error_count for _, error_count in totals)
+    return requests / seconds, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--pool-sizes", default="1,5,10")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--pgbouncer", action="store_true")
+    parser.add_argument("--boards", type=int, default=200)
+    parser.add_argument("--cards-per-board", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        reset_database()
+        board_ids = seed(args.boards, args.cards_per_board)
+        db.engine.dispose()
+
+    print(f"{'workers':>8} {'pool':>6} {'threads':>8} {'req/s':>10} {'errors':>7}")
+    for workers in (int(value) for value in args.workers.split(",")):
+        for pool_size in (int(value) for value in args.pool_sizes.split(",")):
+            throughput, errors = measure(workers, pool_size, args.threads, args.seconds, args.pgbouncer, board_ids)
+            print(f"{workers:>8} {pool_size:>6} {args.threads:>8} {throughput:>10.1f} {errors:>7}")
+
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
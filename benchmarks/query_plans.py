@@ -0,0 +1,73 @@
+"""Compare query plans and latency of the hot queries with and without indexes.
+
+Usage:
+    python -m benchmarks.query_plans [--boards 2000] [--cards-per-board 50]
+"""
+import argparse
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+from .common import create_benchmark_app, reset_database, seed, time_call
+
+
+def hot_queries(board_id):
+    return {
+        "cards for board": db.select(Card).where(Card.board_id == board_id).order_by(Card.id),
+        "boards by owner": db.select(Board).where(Board.owner == "owner-7").order_by(Board.id).limit(100),
+        "boards by owner, next page": (
+            db.select(Board).where(Board.owner == "owner-7", Board.id > board_id).order_by(Board.id).limit(100)
+        ),
+        "boards by owner and title prefix": (
+            db.select(Board).where(Board.owner == "owner-7", Board.title.like("Board 1%")).order_by(Board.id)
+        ),
+    }
+
+
+def explain(query):
+    bind = db.session.get_bind()
+    sql = str(query.compile(bind, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN ANALYZE" if bind.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    rows = db.session.execute(db.text(f"{prefix} {sql}")).all()
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+def measure(queries, label):
+    print(f"\n== {label}")
+    for name, query in queries.items():
+        elapsed = time_call(lambda: db.session.execute(query).all())
+        print(f"{name}: {elapsed:.2f} ms")
+        for line in explain(query):
+            print(f"    {line}")
+
+
+def drop_indexes():
+    bind = db.session.get_bind()
+    db.session.commit()
+    for table in (Card.__table__, Board.__table__):
+        for index in table.indexes:
+            index.drop(bind, checkfirst=True)
+    # Fresh connections, so no cached statement plans survive the drop
+    db.engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boards", type=int, default=2000)
+    parser.add_argument("--cards-per-board", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        reset_database()
+        board_ids = seed(args.boards, args.cards_per_board)
+        queries = hot_queries(board_ids[len(board_ids) // 2])
+
+        measure(queries, "with indexes")
+        drop_indexes()
+        measure(queries, "without indexes")
+
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
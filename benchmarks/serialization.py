@@ -0,0 +1,58 @@
+"""Microbenchmark: time to serialize 1k cards through each path.
+
+Compares hydrating Card objects + to_dict against building payloads from
+result rows, each encoded with Flask's default JSON provider and with the
+orjson provider (when installed).
+
+Usage:
+    python -m benchmarks.serialization [--cards 1000] [--repeat 50]
+"""
+import argparse
+from flask.json.provider import DefaultJSONProvider
+from app.db import db
+from app.json_provider import OrjsonProvider, orjson
+from app.models.card import Card
+from .common import create_benchmark_app, reset_database, seed, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_benchmark_app()
+    with app.app_context():
+        reset_database()
+        board_id = seed(1, args.cards)[0]
+
+        providers = {"default json": DefaultJSONProvider(app)}
+        if orjson is not None:
+            providers["orjson"] = OrjsonProvider(app)
+
+        def orm_payloads():
+            db.session.expunge_all()
+            cards = db.session.scalars(db.select(Card).where(Card.board_id == board_id).order_by(Card.id))
+            return [card.to_dict() for card in cards]
+
+        def row_payloads():
+            query = Card.select_payloads().where(Card.board_id == board_id).order_by(Card.id)
+            return [Card.payload_from_row(row) for row in db.session.execute(query)]
+
+        payloads = row_payloads()
+        timings = {
+            "build: ORM objects + to_dict": time_call(orm_payloads, args.repeat),
+            "build: result rows": time_call(row_payloads, args.repeat),
+        }
+        for provider_name, provider in providers.items():
+            timings[f"encode: {provider_name}"] = time_call(lambda: provider.response(payloads), args.repeat)
+
+        print(f"{'step':<32} {'ms per ' + str(args.cards) + ' cards':>18}")
+        for step, elapsed in timings.items():
+            print(f"{step:<32} {elapsed:>18.2f}")
+
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""add boards owner title index
+
+Revision ID: 2d7e5c9b0a61
+Revises: 9a4f2b7d6c15
+Create Date: 2026-10-18 19:40:05.861290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d7e5c9b0a61'
+down_revision = '9a4f2b7d6c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The composite index also serves owner-only lookups, so it replaces ix_boards_owner
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_index('ix_boards_owner')
+        batch_op.create_index('ix_boards_owner_title', ['owner', 'title'], unique=False,
+                              postgresql_ops={'title': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_index('ix_boards_owner_title')
+        batch_op.create_index('ix_boards_owner', ['owner'], unique=False)
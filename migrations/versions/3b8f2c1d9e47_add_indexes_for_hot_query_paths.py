@@ -0,0 +1,44 @@
+"""add indexes for hot query paths
+
+Revision ID: 3b8f2c1d9e47
+Revises: 9cf21b0be190
+Create Date: 2026-10-18 09:12:40.215377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2c1d9e47'
+down_revision = '9cf21b0be190'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.create_index('ix_cards_board_id_id', ['board_id', 'id'], unique=False)
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.create_index('ix_boards_owner', ['owner'], unique=False)
+
+    # Trigram indexes let ilike('%value%') searches use an index (Postgres only)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_cards_message_trgm', 'cards', ['message'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'})
+        op.create_index('ix_boards_title_trgm', 'boards', ['title'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_boards_title_trgm', table_name='boards')
+        op.drop_index('ix_cards_message_trgm', table_name='cards')
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_index('ix_boards_owner')
+
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_board_id_id')
@@ -0,0 +1,150 @@
+"""skip board aggregates on likes
+
+Revision ID: 3c7e9a2d5f14
+Revises: 8b1d4f6e2c90
+Create Date: 2026-10-18 22:14:36.905127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e9a2d5f14'
+down_revision = '8b1d4f6e2c90'
+branch_labels = None
+depends_on = None
+
+# Copied from app/aggregates.py: likes no longer update the board row, the
+# app folds them into total_likes in batches
+postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Only cards that were deleted or restored change the board row;
+            -- likes alone are folded in later (see TotalLikesRefresher)
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+# The function and the SQLite likes trigger as 9a4f2b7d6c15 created them
+previous_postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes
+            FROM (
+                SELECT board_id, sum(cards) AS cards, sum(likes) AS likes FROM (
+                    SELECT board_id, 1 AS cards, likes FROM new_rows WHERE deleted_at IS NULL
+                    UNION ALL
+                    SELECT board_id, -1, -likes FROM old_rows WHERE deleted_at IS NULL
+                ) AS deltas GROUP BY board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id AND (changed.cards <> 0 OR changed.likes <> 0);
+
+            UPDATE boards SET last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+            WHERE boards.id IN (
+                SELECT new_rows.board_id FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+            );
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+previous_sqlite_likes_trigger = """
+    CREATE TRIGGER cards_aggregates_likes AFTER UPDATE OF likes ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NULL AND NEW.likes <> OLD.likes
+    BEGIN
+        UPDATE boards SET total_likes = total_likes + NEW.likes - OLD.likes WHERE id = NEW.board_id;
+    END
+    """
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(postgres_function)
+    else:
+        op.execute("DROP TRIGGER IF EXISTS cards_aggregates_likes")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(previous_postgres_function)
+    else:
+        op.execute(previous_sqlite_likes_trigger)
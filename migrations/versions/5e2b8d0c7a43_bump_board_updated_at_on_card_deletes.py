@@ -0,0 +1,205 @@
+"""bump board updated_at on card deletes
+
+Revision ID: 5e2b8d0c7a43
+Revises: 3c7e9a2d5f14
+Create Date: 2026-10-18 22:48:09.311574
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8d0c7a43'
+down_revision = '3c7e9a2d5f14'
+branch_labels = None
+depends_on = None
+
+# Copied from app/aggregates.py: deleting or restoring a card also sets the
+# board's updated_at, so the board's Last-Modified never goes backwards
+postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Only cards that were deleted or restored change the board row;
+            -- likes alone are folded in later (see TotalLikesRefresher)
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                updated_at = now(),
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            updated_at = now(),
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+sqlite_last_card_at = (
+    "(SELECT max(created_at) FROM cards WHERE cards.board_id = OLD.board_id AND cards.deleted_at IS NULL)"
+)
+
+sqlite_triggers = [
+    f"""
+    CREATE TRIGGER cards_aggregates_soft_delete AFTER UPDATE OF deleted_at ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            updated_at = CURRENT_TIMESTAMP,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards
+    WHEN OLD.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            updated_at = CURRENT_TIMESTAMP,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+]
+
+# As 3c7e9a2d5f14 left them
+previous_postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Only cards that were deleted or restored change the board row;
+            -- likes alone are folded in later (see TotalLikesRefresher)
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+previous_sqlite_triggers = [
+    f"""
+    CREATE TRIGGER cards_aggregates_soft_delete AFTER UPDATE OF deleted_at ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards
+    WHEN OLD.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+]
+
+
+def replace_triggers(postgres, sqlite):
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(postgres)
+        return
+
+    # SQLite has no CREATE OR REPLACE TRIGGER
+    for trigger in ('soft_delete', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS cards_aggregates_{trigger}")
+    for statement in sqlite:
+        op.execute(statement)
+
+
+def upgrade():
+    replace_triggers(postgres_function, sqlite_triggers)
+
+
+def downgrade():
+    replace_triggers(previous_postgres_function, previous_sqlite_triggers)
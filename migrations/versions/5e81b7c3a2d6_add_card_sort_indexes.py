@@ -0,0 +1,30 @@
+"""add card sort indexes
+
+Revision ID: 5e81b7c3a2d6
+Revises: 7c2d9a4e1f53
+Create Date: 2026-10-18 15:27:08.734519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e81b7c3a2d6'
+down_revision = '7c2d9a4e1f53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.create_index('ix_cards_board_id_likes_id', ['board_id', 'likes', 'id'], unique=False)
+        batch_op.create_index('ix_cards_board_id_created_at_id', ['board_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_cards_board_id_updated_at_id', ['board_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cards', schema=None) as batch_op:
+        batch_op.drop_index('ix_cards_board_id_updated_at_id')
+        batch_op.drop_index('ix_cards_board_id_created_at_id')
+        batch_op.drop_index('ix_cards_board_id_likes_id')
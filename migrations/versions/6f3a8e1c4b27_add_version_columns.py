@@ -0,0 +1,28 @@
+"""add version columns
+
+Revision ID: 6f3a8e1c4b27
+Revises: 2d7e5c9b0a61
+Create Date: 2026-10-18 20:24:51.337062
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f3a8e1c4b27'
+down_revision = '2d7e5c9b0a61'
+branch_labels = None
+depends_on = None
+
+
+# Plain ALTER TABLE, no batch copy: recreating cards on SQLite would drop the
+# aggregate triggers on it (needs SQLite 3.35+ for DROP COLUMN)
+def upgrade():
+    op.add_column('boards', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('cards', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('cards', 'version')
+    op.drop_column('boards', 'version')
@@ -0,0 +1,43 @@
+"""add search vectors
+
+Revision ID: 7c2d9a4e1f53
+Revises: 3b8f2c1d9e47
+Create Date: 2026-10-18 14:03:51.602114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d9a4e1f53'
+down_revision = '3b8f2c1d9e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated tsvector columns are kept up to date by Postgres on every write
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE boards ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(owner, ''))) STORED"
+    )
+    op.execute(
+        "ALTER TABLE cards ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('english', coalesce(message, ''))) STORED"
+    )
+    op.create_index('ix_boards_search_vector', 'boards', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('ix_cards_search_vector', 'cards', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_cards_search_vector', table_name='cards')
+    op.drop_index('ix_boards_search_vector', table_name='boards')
+    op.drop_column('cards', 'search_vector')
+    op.drop_column('boards', 'search_vector')
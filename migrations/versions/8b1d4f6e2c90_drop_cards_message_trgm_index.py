@@ -0,0 +1,28 @@
+"""drop cards message trgm index
+
+Revision ID: 8b1d4f6e2c90
+Revises: 6f3a8e1c4b27
+Create Date: 2026-10-18 21:05:12.640218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1d4f6e2c90'
+down_revision = '6f3a8e1c4b27'
+branch_labels = None
+depends_on = None
+
+
+# Card search uses the search_vector index, so no query reads this one any more
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_cards_message_trgm', table_name='cards')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index('ix_cards_message_trgm', 'cards', ['message'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'})
@@ -0,0 +1,160 @@
+"""add board card aggregates
+
+Revision ID: 9a4f2b7d6c15
+Revises: c4d0e6a3b918
+Create Date: 2026-10-18 19:02:17.508311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f2b7d6c15'
+down_revision = 'c4d0e6a3b918'
+branch_labels = None
+depends_on = None
+
+# Copied from app/aggregates.py so this migration keeps creating the same triggers
+postgres_triggers = [
+    """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes
+            FROM (
+                SELECT board_id, sum(cards) AS cards, sum(likes) AS likes FROM (
+                    SELECT board_id, 1 AS cards, likes FROM new_rows WHERE deleted_at IS NULL
+                    UNION ALL
+                    SELECT board_id, -1, -likes FROM old_rows WHERE deleted_at IS NULL
+                ) AS deltas GROUP BY board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id AND (changed.cards <> 0 OR changed.likes <> 0);
+
+            UPDATE boards SET last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+            WHERE boards.id IN (
+                SELECT new_rows.board_id FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+            );
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    "CREATE TRIGGER cards_aggregates_insert AFTER INSERT ON cards REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+    "CREATE TRIGGER cards_aggregates_update AFTER UPDATE ON cards REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+    "CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION cards_board_aggregates()",
+]
+
+sqlite_last_card_at = (
+    "(SELECT max(created_at) FROM cards WHERE cards.board_id = OLD.board_id AND cards.deleted_at IS NULL)"
+)
+
+sqlite_triggers = [
+    """
+    CREATE TRIGGER cards_aggregates_insert AFTER INSERT ON cards WHEN NEW.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count + 1,
+            total_likes = total_likes + NEW.likes,
+            last_card_at = max(coalesce(last_card_at, NEW.created_at), NEW.created_at)
+        WHERE id = NEW.board_id;
+    END
+    """,
+    """
+    CREATE TRIGGER cards_aggregates_likes AFTER UPDATE OF likes ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NULL AND NEW.likes <> OLD.likes
+    BEGIN
+        UPDATE boards SET total_likes = total_likes + NEW.likes - OLD.likes WHERE id = NEW.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_soft_delete AFTER UPDATE OF deleted_at ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER cards_aggregates_delete AFTER DELETE ON cards WHEN OLD.deleted_at IS NULL
+    BEGIN
+        UPDATE boards SET
+            card_count = card_count - 1,
+            total_likes = total_likes - OLD.likes,
+            last_card_at = {sqlite_last_card_at}
+        WHERE id = OLD.board_id;
+    END
+    """,
+]
+
+live_cards = "FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL"
+
+
+def upgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('card_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('total_likes', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_card_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        f"UPDATE boards SET "
+        f"card_count = (SELECT count(*) {live_cards}), "
+        f"total_likes = (SELECT coalesce(sum(likes), 0) {live_cards}), "
+        f"last_card_at = (SELECT max(created_at) {live_cards})"
+    )
+
+    triggers = postgres_triggers if op.get_bind().dialect.name == 'postgresql' else sqlite_triggers
+    for statement in triggers:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for trigger in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS cards_aggregates_{trigger} ON cards")
+        op.execute("DROP FUNCTION IF EXISTS cards_board_aggregates()")
+    else:
+        for trigger in ('insert', 'likes', 'soft_delete', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS cards_aggregates_{trigger}")
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_column('last_card_at')
+        batch_op.drop_column('total_likes')
+        batch_op.drop_column('card_count')
@@ -0,0 +1,168 @@
+"""maintain board total_likes on likes
+
+Revision ID: 9d4a6c1f8b27
+Revises: 5e2b8d0c7a43
+Create Date: 2026-10-18 23:41:27.508316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a6c1f8b27'
+down_revision = '5e2b8d0c7a43'
+branch_labels = None
+depends_on = None
+
+# Copied from app/aggregates.py: likes on live cards add their difference to
+# total_likes in the same transaction, without touching updated_at
+postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Cards that were deleted or restored
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                updated_at = now(),
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+
+            -- Likes on cards that stayed live, without touching updated_at
+            UPDATE boards SET total_likes = boards.total_likes + liked.likes
+            FROM (
+                SELECT new_rows.board_id, sum(new_rows.likes - old_rows.likes) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE new_rows.deleted_at IS NULL AND old_rows.deleted_at IS NULL AND new_rows.likes <> old_rows.likes
+                GROUP BY new_rows.board_id
+            ) AS liked
+            WHERE boards.id = liked.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            updated_at = now(),
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+sqlite_likes_trigger = """
+    CREATE TRIGGER cards_aggregates_likes AFTER UPDATE OF likes ON cards
+    WHEN OLD.deleted_at IS NULL AND NEW.deleted_at IS NULL AND NEW.likes <> OLD.likes
+    BEGIN
+        UPDATE boards SET total_likes = total_likes + NEW.likes - OLD.likes WHERE id = NEW.board_id;
+    END
+    """
+
+# As 5e2b8d0c7a43 left it
+previous_postgres_function = """
+    CREATE OR REPLACE FUNCTION cards_board_aggregates() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE boards SET
+                card_count = boards.card_count + added.cards,
+                total_likes = boards.total_likes + added.likes,
+                last_card_at = greatest(boards.last_card_at, added.last_card_at)
+            FROM (
+                SELECT board_id, count(*) AS cards, sum(likes) AS likes, max(created_at) AS last_card_at
+                FROM new_rows WHERE deleted_at IS NULL GROUP BY board_id
+            ) AS added
+            WHERE boards.id = added.board_id;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'UPDATE' THEN
+            -- Only cards that were deleted or restored change the board row;
+            -- likes alone are folded in later (see TotalLikesRefresher)
+            UPDATE boards SET
+                card_count = boards.card_count + changed.cards,
+                total_likes = boards.total_likes + changed.likes,
+                updated_at = now(),
+                last_card_at = (
+                    SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+                )
+            FROM (
+                SELECT
+                    new_rows.board_id,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN 1 ELSE -1 END) AS cards,
+                    sum(CASE WHEN new_rows.deleted_at IS NULL THEN new_rows.likes ELSE -old_rows.likes END) AS likes
+                FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE (new_rows.deleted_at IS NULL) <> (old_rows.deleted_at IS NULL)
+                GROUP BY new_rows.board_id
+            ) AS changed
+            WHERE boards.id = changed.board_id;
+            RETURN NULL;
+        END IF;
+
+        UPDATE boards SET
+            card_count = boards.card_count - removed.cards,
+            total_likes = boards.total_likes - removed.likes,
+            updated_at = now(),
+            last_card_at = (
+                SELECT max(created_at) FROM cards WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL
+            )
+        FROM (
+            SELECT board_id, count(*) AS cards, sum(likes) AS likes
+            FROM old_rows WHERE deleted_at IS NULL GROUP BY board_id
+        ) AS removed
+        WHERE boards.id = removed.board_id;
+        RETURN NULL;
+    END;
+    $$
+    """
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(postgres_function)
+    else:
+        op.execute(sqlite_likes_trigger)
+
+    # Likes since 3c7e9a2d5f14 were folded in later; catch total_likes up
+    op.execute(
+        "UPDATE boards SET total_likes = (SELECT coalesce(sum(likes), 0) FROM cards "
+        "WHERE cards.board_id = boards.id AND cards.deleted_at IS NULL)"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(previous_postgres_function)
+    else:
+        op.execute("DROP TRIGGER IF EXISTS cards_aggregates_likes")
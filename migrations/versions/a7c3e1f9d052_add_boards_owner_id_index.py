@@ -0,0 +1,27 @@
+"""add boards owner id index
+
+Revision ID: a7c3e1f9d052
+Revises: 9d4a6c1f8b27
+Create Date: 2026-10-19 00:12:44.197306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e1f9d052'
+down_revision = '9d4a6c1f8b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GET /boards?owner= pages by id; ix_boards_owner_title stays for title prefixes
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.create_index('ix_boards_owner_id', ['owner', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_index('ix_boards_owner_id')
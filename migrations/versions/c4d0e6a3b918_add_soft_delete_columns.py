@@ -0,0 +1,44 @@
+"""add soft delete columns
+
+Revision ID: c4d0e6a3b918
+Revises: 5e81b7c3a2d6
+Create Date: 2026-10-18 18:31:44.120953
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d0e6a3b918'
+down_revision = '5e81b7c3a2d6'
+branch_labels = None
+depends_on = None
+
+# Names the unnamed foreign key of the init migration the way Postgres does,
+# so SQLite's batch mode can drop it too
+naming_convention = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def upgrade():
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_boards_deleted_at', ['deleted_at'], unique=False)
+
+    with op.batch_alter_table('cards', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_cards_deleted_at', ['deleted_at'], unique=False)
+        batch_op.drop_constraint('cards_board_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('cards_board_id_fkey', 'boards', ['board_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('cards', schema=None, naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('cards_board_id_fkey', type_='foreignkey')
+        batch_op.create_foreign_key('cards_board_id_fkey', 'boards', ['board_id'], ['id'])
+        batch_op.drop_index('ix_cards_deleted_at')
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('boards', schema=None) as batch_op:
+        batch_op.drop_index('ix_boards_deleted_at')
+        batch_op.drop_column('deleted_at')
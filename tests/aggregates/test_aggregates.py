@@ -0,0 +1,120 @@
+from datetime import datetime
+import pytest
+from app.aggregates import repair_board_aggregates
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+
+
+def aggregates(client, board_id=1):
+    board = next(board for board in client.get("/boards").get_json() if board["id"] == board_id)
+    return board["card_count"], board["total_likes"]
+
+
+def test_card_writes_update_board_aggregates(client, one_board):
+    client.post("/boards/1/cards", json={"message": "One"})
+    client.post("/boards/1/cards/bulk", json={"messages": ["Two", "Three"]})
+    client.patch("/cards/1/like")
+    client.patch("/cards/1/like")
+    client.put("/cards/2", json={"message": "Two", "likes": 5})
+
+    assert aggregates(client) == (3, 7)
+
+    client.delete("/cards/2")
+    assert aggregates(client) == (2, 2)
+
+    client.delete("/boards/1/cards/bulk", json={"ids": [1, 3]})
+    board = client.get("/boards").get_json()[0]
+    assert (board["card_count"], board["total_likes"], board["last_card_at"]) == (0, 0, None)
+
+
+def test_last_card_at_follows_newest_live_card(client, one_board):
+    db.session.add_all([
+        Card(message="Older", board_id=1, created_at=datetime(2026, 1, 1)),
+        Card(message="Newer", board_id=1, created_at=datetime(2026, 2, 1)),
+    ])
+    db.session.commit()
+
+    assert client.get("/boards").get_json()[0]["last_card_at"].startswith("2026-02-01")
+
+    client.delete("/cards/2")
+    assert client.get("/boards").get_json()[0]["last_card_at"].startswith("2026-01-01")
+
+
+def test_snapshot_import_counts_cards(client, board_with_cards):
+    snapshot = client.get("/boards/1/export").get_data()
+
+    client.post("/boards/import", data=snapshot, content_type="application/x-ndjson")
+
+    assert aggregates(client, board_id=2) == (2, 1)
+
+
+def test_list_etag_changes_after_like(client, board_with_cards):
+    etag = client.get("/boards").headers["ETag"]
+
+    client.patch("/cards/1/like")
+
+    assert client.get("/boards", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_repair_board_aggregates(app, client, board_with_cards, three_boards):
+    db.session.execute(db.update(Board).values(card_count=42, total_likes=-1, last_card_at=None))
+    db.session.commit()
+
+    assert repair_board_aggregates(batch_size=2) == 4
+    assert [aggregates(client, board_id) for board_id in (1, 2, 3, 4)] == [(2, 1), (0, 0), (0, 0), (0, 0)]
+    assert client.get("/boards").get_json()[0]["last_card_at"] is not None
+
+
+def test_repair_keeps_board_updated_at(app, board_with_cards, three_boards):
+    db.session.execute(db.update(Board).values(card_count=0, updated_at=datetime(2026, 1, 1)))
+    db.session.commit()
+
+    repair_board_aggregates()
+
+    assert set(db.session.scalars(db.select(Board.updated_at))) == {datetime(2026, 1, 1)}
+
+
+def test_repair_command(app, board_with_cards):
+    db.session.execute(db.update(Board).values(card_count=0))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["repair-board-aggregates"])
+
+    assert result.exit_code == 0
+    assert "Repaired 1 boards" in result.output
+    assert db.session.scalar(db.select(Board.card_count)) == 2
+
+
+class TestWriteBehindLikes:
+    @pytest.fixture
+    def app_config(self):
+        return {"LIKE_WRITE_BEHIND": True, "LIKE_BUFFER_MAX_PENDING": 100, "LIKE_BUFFER_FLUSH_SECONDS": 60}
+
+    def test_flushed_likes_are_counted(self, app, client, board_with_cards):
+        for _ in range(3):
+            client.patch("/cards/1/like")
+
+        app.extensions["like_buffer"].flush()
+
+        assert aggregates(client) == (2, 4)
+
+
+def test_likes_keep_board_updated_at(client, board_with_cards):
+    updated_at = db.session.scalar(db.select(Board.updated_at))
+
+    client.patch("/cards/1/like")
+    client.put("/cards/2", json={"likes": 4})
+    db.session.remove()
+
+    assert aggregates(client) == (2, 5)
+    assert db.session.scalar(db.select(Board.updated_at)) == updated_at
+
+
+def test_likes_on_deleted_cards_are_not_counted(client, board_with_cards):
+    client.delete("/cards/1")
+
+    db.session.execute(db.update(Card).where(Card.id == 1).values(likes=Card.likes + 5))
+    db.session.commit()
+
+    assert aggregates(client) == (1, 1)
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import ANY
+from sqlalchemy import create_engine
+
+pytest.importorskip("asgiref")
+pytest.importorskip("aiosqlite")
+
+from app import create_app
+from app.asgi import AsyncBoardApp
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+
+
+@pytest.fixture
+def flask_app(tmp_path):
+    # The async engine needs a database file it can share with the sync one
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'asgi.db'}"})
+    with app.app_context():
+        db.create_all()
+        board = Board(title="Daily Affirmations", owner="Test Owner")
+        db.session.add(board)
+        db.session.commit()
+        db.session.add_all([
+            Card(message="You can do it", likes=0, board_id=board.id),
+            Card(message="Keep going", likes=1, board_id=board.id),
+        ])
+        db.session.commit()
+        db.session.remove()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.fixture
+def asgi_app(flask_app):
+    app = AsyncBoardApp(flask_app)
+    yield app
+    asyncio.run(app.engine.dispose())
+
+
+def call(app, method, path, query_string=b"", headers=(), body=b""):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(b"host", b"localhost"), *headers],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+def test_async_get_all_boards(asgi_app):
+    status, headers, body = call(asgi_app, "GET", "/boards")
+
+    assert status == 200
+    assert json.loads(body) == [{
+        "id": 1,
+        "title": "Daily Affirmations",
+        "owner": "Test Owner",
+        "card_count": 2,
+        "total_likes": 1,
+        "last_card_at": ANY,
+    }]
+    assert headers[b"etag"]
+
+
+def test_async_get_one_board_matches_flask(asgi_app, flask_app):
+    status, headers, body = call(asgi_app, "GET", "/boards/1")
+    flask_response = flask_app.test_client().get("/boards/1")
+
+    assert status == 200
+    assert json.loads(body) == flask_response.get_json()
+    assert headers[b"etag"].decode() == flask_response.headers["ETag"]
+
+
+def test_async_get_cards_for_board(asgi_app):
+    status, _, body = call(asgi_app, "GET", "/boards/1/cards")
+
+    assert status == 200
+    assert [card["message"] for card in json.loads(body)] == ["You can do it", "Keep going"]
+
+
+def test_async_get_one_card_not_found(asgi_app):
+    status, _, body = call(asgi_app, "GET", "/cards/99")
+
+    assert status == 404
+    assert json.loads(body) == {"message": "Card 99 not found"}
+
+
+def test_async_invalid_id(asgi_app):
+    status, _, body = call(asgi_app, "GET", "/boards/abc")
+
+    assert status == 400
+    assert json.loads(body) == {"message": "Board abc invalid"}
+
+
+def test_async_like_card(asgi_app, flask_app):
+    call(asgi_app, "PATCH", "/cards/2/like")
+    status, _, body = call(asgi_app, "PATCH", "/cards/2/like")
+
+    assert status == 200
+    assert json.loads(body)["likes"] == 3
+    with flask_app.app_context():
+        assert db.session.get(Card, 2).likes == 3
+
+
+def test_async_falls_back_to_flask(asgi_app):
+    status, _, body = call(asgi_app, "GET", "/boards", query_string=b"limit=1")
+
+    assert status == 200
+    assert [board["id"] for board in json.loads(body)] == [1]
+
+
+def test_async_conditional_request_falls_back_to_flask(asgi_app):
+    _, headers, _ = call(asgi_app, "GET", "/cards/1")
+
+    status, _, body = call(asgi_app, "GET", "/cards/1", headers=[(b"if-none-match", headers[b"etag"])])
+
+    assert status == 304
+    assert body == b""
+
+
+def test_async_reads_from_replica(flask_app, tmp_path):
+    replica_uri = f"sqlite:///{tmp_path / 'replica.db'}"
+    flask_app.config["SQLALCHEMY_REPLICA_DATABASE_URI"] = replica_uri
+    flask_app.extensions["read_replica"] = 5
+    # An empty replica that has not caught up with the primary yet
+    replica_engine = create_engine(replica_uri)
+    db.metadata.create_all(replica_engine)
+    app = AsyncBoardApp(flask_app)
+
+    status, _, body = call(app, "GET", "/boards")
+    assert (status, json.loads(body)) == (200, [])
+    assert "PATCH" not in [method for method, _, _ in app.routes]
+
+    # A client pinned to the primary after a write is served by Flask
+    status, _, body = call(app, "GET", "/boards", headers=[(b"cookie", b"read_primary=1")])
+    assert [board["id"] for board in json.loads(body)] == [1]
+
+    asyncio.run(app.engine.dispose())
+    asyncio.run(app.replica_engine.dispose())
+    replica_engine.dispose()
+
+
+def test_async_write_completes_while_event_stream_is_open(asgi_app, flask_app):
+    flask_app.config["EVENTS_KEEPALIVE_SECONDS"] = 0.05
+    stream_scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/boards/1/events",
+        "raw_path": b"/boards/1/events",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+
+    async def run():
+        streaming, closed = asyncio.Event(), False
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            # Stands in for the client going away once the test is done
+            if closed:
+                raise OSError("client disconnected")
+            if message.get("body"):
+                streaming.set()
+
+        stream = asyncio.create_task(asgi_app(stream_scope, receive, send))
+        try:
+            await asyncio.wait_for(streaming.wait(), timeout=5)
+            status, _, _ = await asyncio.wait_for(asyncio.to_thread(
+                call, asgi_app, "PUT", "/cards/1",
+                headers=[(b"content-type", b"application/json"), (b"content-length", b"22")],
+                body=b'{"message": "Updated"}',
+            ), timeout=5)
+        finally:
+            closed = True
+            with pytest.raises(OSError):
+                await asyncio.wait_for(stream, timeout=5)
+        return status
+
+    assert asyncio.run(run()) == 200
@@ -1,6 +1,10 @@
 import pytest
+from unittest.mock import ANY
 from app.db import db
 from app.models.board import Board
+from app.models.card import Card
+from app.routes.route_utilities import validate_model
+from sqlalchemy.orm import selectinload
 
 
 def test_board_to_dict():
@@ -33,7 +37,14 @@ def test_get_boards_one_saved_board(client, one_board):
     response_body = response.get_json()
 
     assert response.status_code == 200
-    assert response_body == [{"id": 1, "title": "Daily Affirmations", "owner": "Test Owner", "card_count": 0}]
+    assert response_body == [{
+        "id": 1,
+        "title": "Daily Affirmations",
+        "owner": "Test Owner",
+        "card_count": 0,
+        "total_likes": 0,
+        "last_card_at": None,
+    }]
 
 
 def test_get_boards_includes_card_count(client, board_with_cards):
@@ -41,9 +52,33 @@ def test_get_boards_includes_card_count(client, board_with_cards):
     response_body = response.get_json()
 
     assert response.status_code == 200
-    assert response_body == [
-        {"id": 1, "title": "Daily Affirmations", "owner": "Test Owner", "card_count": 2}
-    ]
+    assert response_body == [{
+        "id": 1,
+        "title": "Daily Affirmations",
+        "owner": "Test Owner",
+        "card_count": 2,
+        "total_likes": 1,
+        "last_card_at": ANY,
+    }]
+    assert response_body[0]["last_card_at"] is not None
+
+
+def test_get_boards_card_count_per_board(client, board_with_cards):
+    client.post("/boards", json={"title": "Empty Board", "owner": "Owner"})
+
+    response = client.get("/boards")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert [board["card_count"] for board in response_body] == [2, 0]
+
+
+def test_update_board_includes_card_count(client, board_with_cards):
+    response = client.put("/boards/1", json={"title": "Renamed"})
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert response_body["card_count"] == 2
 
 
 def test_create_board(client):
@@ -51,7 +86,14 @@ def test_create_board(client):
     response_body = response.get_json()
 
     assert response.status_code == 201
-    assert response_body == {"id": 1, "title": "New Board", "owner": "Creator", "card_count": 0}
+    assert response_body == {
+        "id": 1,
+        "title": "New Board",
+        "owner": "Creator",
+        "card_count": 0,
+        "total_likes": 0,
+        "last_card_at": None,
+    }
 
     board = db.session.scalar(db.select(Board).where(Board.id == 1))
     assert board
@@ -128,3 +170,20 @@ def test_delete_board_not_found(client):
     assert response.status_code == 404
     assert response_body == {"message": "Board 1 not found"}
     assert db.session.scalars(db.select(Board)).all() == []
+
+
+def test_delete_board_deletes_cards(client, board_with_cards):
+    response = client.delete("/boards/1")
+
+    assert response.status_code == 204
+    assert db.session.scalars(db.select(Card)).all() == []
+
+
+def test_validate_model_applies_loader_options(app, board_with_cards):
+    db.session.expunge_all()
+
+    board = validate_model(Board, "1", options=[selectinload(Board.cards)])
+
+    # Loaded with the board instead of lazily on first access
+    assert "cards" in board.__dict__
+    assert len(board.cards) == 2
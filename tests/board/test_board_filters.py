@@ -0,0 +1,75 @@
+from datetime import datetime
+import pytest
+from app.db import db
+from app.models.board import Board
+
+
+@pytest.fixture
+def owned_boards(app):
+    db.session.add_all(
+        [
+            Board(title="Daily Affirmations", owner="ada", created_at=datetime(2026, 1, 1)),
+            Board(title="Daily Wins", owner="ada", created_at=datetime(2026, 3, 1)),
+            Board(title="Weekly Goals", owner="ada", created_at=datetime(2026, 5, 1)),
+            Board(title="Daily Affirmations", owner="grace", created_at=datetime(2026, 5, 1)),
+            Board(title="100%_done", owner="ada", created_at=datetime(2026, 6, 1)),
+        ]
+    )
+    db.session.commit()
+
+
+def board_ids(response):
+    assert response.status_code == 200
+    return [board["id"] for board in response.get_json()]
+
+
+def test_filter_boards_by_owner(client, owned_boards):
+    assert board_ids(client.get("/boards?owner=ada")) == [1, 2, 3, 5]
+    assert board_ids(client.get("/boards?owner=grace")) == [4]
+    assert board_ids(client.get("/boards?owner=nobody")) == []
+
+
+def test_filter_boards_by_title_prefix(client, owned_boards):
+    assert board_ids(client.get("/boards?owner=ada&title_prefix=Daily")) == [1, 2]
+    assert board_ids(client.get("/boards?title_prefix=Daily A")) == [1, 4]
+
+
+def test_title_prefix_matches_wildcards_literally(client, owned_boards):
+    assert board_ids(client.get("/boards?title_prefix=100%25_")) == [5]
+    assert board_ids(client.get("/boards?title_prefix=%25")) == []
+    assert board_ids(client.get("/boards?title_prefix=_")) == []
+
+
+def test_filter_boards_created_after(client, owned_boards):
+    assert board_ids(client.get("/boards?owner=ada&created_after=2026-02-01")) == [2, 3, 5]
+    assert board_ids(client.get("/boards?created_after=2026-05-01T00:00:00")) == [5]
+
+
+def test_filtered_boards_paginate(client, owned_boards):
+    response = client.get("/boards?owner=ada&limit=2")
+
+    assert board_ids(response) == [1, 2]
+    assert response.headers["X-Next-Cursor"] == "2"
+    assert "owner=ada" in response.headers["Link"]
+
+    response = client.get("/boards?owner=ada&after_id=2&limit=2")
+    assert board_ids(response) == [3, 5]
+    assert "Link" not in response.headers
+
+
+def test_filtered_boards_etag_only_tracks_matching_boards(client, owned_boards):
+    etag = client.get("/boards?owner=grace").headers["ETag"]
+
+    client.post("/boards", json={"title": "New", "owner": "ada"})
+    assert client.get("/boards?owner=grace", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/boards", json={"title": "Newer", "owner": "grace"})
+    assert client.get("/boards?owner=grace", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("query", ["owner=", "title_prefix=", "created_after=yesterday"])
+def test_invalid_board_filters(client, owned_boards, query):
+    response = client.get(f"/boards?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
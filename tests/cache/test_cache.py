@@ -0,0 +1,170 @@
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.cache import LRUBackend, RedisBackend, RequestCoalescer
+from app.db import db
+from app.models.card import Card
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+def test_lru_backend_evicts_least_recently_used():
+    backend = LRUBackend(maxsize=2, ttl=30)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+
+def test_lru_backend_expires_entries():
+    backend = LRUBackend(maxsize=2, ttl=0)
+    backend.set("a", 1)
+
+    assert backend.get("a") is None
+
+
+def test_redis_backend_round_trips_json():
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix="test:")
+    backend.set("board:1", {"id": 1})
+
+    assert client.values == {"test:board:1": '{"id": 1}'}
+    assert backend.get("board:1") == {"id": 1}
+
+    backend.delete("board:1")
+    assert backend.get("board:1") is None
+
+
+@pytest.fixture(params=["lru", "redis"])
+def app_config(request):
+    return {"RESPONSE_CACHE_BACKEND": request.param, "RESPONSE_CACHE_CLIENT": FakeRedis()}
+
+
+def test_get_one_board_is_cached(client, one_board):
+    client.get("/boards/1")
+    response = client.get("/boards/1")
+
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "Daily Affirmations"
+    assert client.get("/cache/stats").get_json() == {"enabled": True, "hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_create_card_invalidates_board(client, one_board):
+    client.get("/boards/1")
+    client.get("/boards/1/cards")
+    client.post("/boards/1/cards", json={"message": "Stay kind"})
+
+    assert len(client.get("/boards/1").get_json()["cards"]) == 1
+    assert len(client.get("/boards/1/cards").get_json()) == 1
+
+
+def test_like_card_invalidates_board(client, one_card):
+    client.get("/boards/1/cards")
+    client.patch("/cards/1/like")
+
+    assert client.get("/boards/1/cards").get_json()[0]["likes"] == 1
+
+
+def test_delete_board_invalidates_board(client, one_board):
+    client.get("/boards/1")
+    client.delete("/boards/1")
+
+    assert client.get("/boards/1").status_code == 404
+
+
+def test_cached_board_not_found_is_not_cached(client):
+    client.get("/boards/1")
+    client.post("/boards", json={"title": "New Board", "owner": "Creator"})
+
+    assert client.get("/boards/1").status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/boards/1", "/boards/1/cards"])
+def test_cached_board_is_rebuilt_for_new_etag(client, one_board, path):
+    client.get(path)
+    # A write in another worker leaves this worker's entry in place
+    db.session.add(Card(message="Stay kind", board_id=1))
+    db.session.commit()
+
+    response = client.get(path)
+    etag = response.headers["ETag"]
+    cards = response.get_json()["cards"] if path == "/boards/1" else response.get_json()
+
+    assert [card["message"] for card in cards] == ["Stay kind"]
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_request_coalescer_shares_concurrent_builds():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.set()
+        release.wait(5)
+        return {"id": 1}
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(coalescer.run, "board:1", build)
+        started.wait(5)
+        followers = [executor.submit(coalescer.run, "board:1", build) for _ in range(2)]
+        while coalescer.coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result(), *(follower.result() for follower in followers)]
+
+    assert len(builds) == 1
+    assert results == [{"id": 1}] * 3
+
+
+def test_request_coalescer_keeps_nothing_after_build():
+    coalescer = RequestCoalescer()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        coalescer.run("board:1", fail)
+
+    assert coalescer.run("board:1", lambda: {"id": 2}) == {"id": 2}
+    assert coalescer.coalesced == 0
+
+
+def test_request_coalescer_does_not_share_builds_across_etags():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+
+    def build_old():
+        started.set()
+        release.wait(5)
+        return {"likes": 0}
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        old = executor.submit(coalescer.run, "board:1", build_old, '"1-old"')
+        started.wait(5)
+        new = coalescer.run("board:1", lambda: {"likes": 1}, '"1-new"')
+        release.set()
+
+        assert (old.result(), new) == ({"likes": 0}, {"likes": 1})
+    assert coalescer.coalesced == 0
@@ -0,0 +1,59 @@
+from app.db import db
+from app.models.card import Card
+
+
+def test_create_cards_bulk(client, one_board):
+    response = client.post("/boards/1/cards/bulk", json={"messages": ["Stay kind", "Keep going"]})
+    response_body = response.get_json()
+
+    assert response.status_code == 201
+    assert response_body == [
+        {"id": 1, "message": "Stay kind", "likes": 0, "board_id": 1},
+        {"id": 2, "message": "Keep going", "likes": 0, "board_id": 1},
+    ]
+    assert len(db.session.scalars(db.select(Card)).all()) == 2
+
+
+def test_create_cards_bulk_rejects_any_invalid_message(client, one_board):
+    response = client.post("/boards/1/cards/bulk", json={"messages": ["Stay kind", "a" * 41]})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
+    assert db.session.scalars(db.select(Card)).all() == []
+
+
+def test_create_cards_bulk_requires_messages(client, one_board):
+    for request_body in [{}, {"messages": []}, {"messages": "Stay kind"}, ["Stay kind"]]:
+        response = client.post("/boards/1/cards/bulk", json=request_body)
+
+        assert response.status_code == 400
+        assert response.get_json() == {"details": "Invalid data"}
+
+
+def test_create_cards_bulk_board_not_found(client):
+    response = client.post("/boards/1/cards/bulk", json={"messages": ["Stay kind"]})
+
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Board 1 not found"}
+
+
+def test_delete_cards_bulk(client, board_with_cards):
+    response = client.delete("/boards/1/cards/bulk", json={"ids": [1, 2]})
+
+    assert response.status_code == 204
+    assert db.session.scalars(db.select(Card)).all() == []
+
+
+def test_delete_cards_bulk_unknown_id_deletes_nothing(client, board_with_cards):
+    response = client.delete("/boards/1/cards/bulk", json={"ids": [1, 99]})
+
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Card 99 not found"}
+    assert len(db.session.scalars(db.select(Card)).all()) == 2
+
+
+def test_delete_cards_bulk_invalid_ids(client, board_with_cards):
+    response = client.delete("/boards/1/cards/bulk", json={"ids": ["1"]})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
@@ -0,0 +1,75 @@
+import pytest
+from app.db import db
+from app.models.card import Card
+
+
+@pytest.fixture
+def app_config():
+    return {
+        "LIKE_WRITE_BEHIND": True,
+        "LIKE_BUFFER_MAX_PENDING": 3,
+        "LIKE_BUFFER_FLUSH_SECONDS": 60,
+    }
+
+
+def test_like_card_write_behind_buffers_likes(app, client, one_card):
+    client.patch("/cards/1/like")
+    response = client.patch("/cards/1/like")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert response_body["likes"] == 2
+
+    card = db.session.scalar(db.select(Card).where(Card.id == 1))
+    assert card.likes == 0
+    assert app.extensions["like_buffer"].pending(1) == 2
+
+    app.extensions["like_buffer"].flush()
+    db.session.expire_all()
+    assert db.session.get(Card, 1).likes == 2
+    assert db.session.get(Card, 1).version == 2
+
+
+def test_like_card_write_behind_flushes_batch(app, client, one_card):
+    for _ in range(3):
+        client.patch("/cards/1/like")
+
+    card = db.session.scalar(db.select(Card).where(Card.id == 1))
+    assert card.likes == 3
+    assert app.extensions["like_buffer"].pending(1) == 0
+
+
+def test_like_card_write_behind_explicit_flush(app, client, one_card):
+    client.patch("/cards/1/like")
+
+    assert app.extensions["like_buffer"].flush() == 1
+
+    card = db.session.scalar(db.select(Card).where(Card.id == 1))
+    assert card.likes == 1
+
+
+def test_like_card_write_behind_not_found(client):
+    response = client.patch("/cards/1/like")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Card 1 not found"}
+
+
+class TestWriteBehindWithCache:
+    @pytest.fixture
+    def app_config(self):
+        return {
+            "LIKE_WRITE_BEHIND": True,
+            "LIKE_BUFFER_MAX_PENDING": 100,
+            "LIKE_BUFFER_FLUSH_SECONDS": 60,
+            "RESPONSE_CACHE_BACKEND": "lru",
+        }
+
+    def test_flush_invalidates_cached_board(self, app, client, one_card):
+        client.patch("/cards/1/like")
+        # Cached while the like is still pending
+        assert client.get("/boards/1").get_json()["cards"][0]["likes"] == 0
+
+        app.extensions["like_buffer"].flush()
+
+        assert client.get("/boards/1").get_json()["cards"][0]["likes"] == 1
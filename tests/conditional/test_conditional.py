@@ -0,0 +1,176 @@
+from datetime import datetime
+import pytest
+from werkzeug.exceptions import HTTPException
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+from app.routes.route_utilities import update_model
+
+
+def test_get_one_board_sets_validators(client, one_board):
+    response = client.get("/boards/1")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_get_one_board_if_none_match(client, one_board):
+    etag = client.get("/boards/1").headers["ETag"]
+
+    response = client.get("/boards/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_get_one_board_if_modified_since(client, one_board):
+    last_modified = client.get("/boards/1").headers["Last-Modified"]
+
+    response = client.get("/boards/1", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
+
+
+def test_new_card_changes_board_etag(client, one_board):
+    etag = client.get("/boards/1/cards").headers["ETag"]
+    client.post("/boards/1/cards", json={"message": "Stay kind"})
+
+    response = client.get("/boards/1/cards", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+
+def test_like_changes_card_etag(client, one_card):
+    etag = client.get("/cards/1").headers["ETag"]
+    client.patch("/cards/1/like")
+
+    response = client.get("/cards/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.get_json()["likes"] == 1
+
+
+@pytest.mark.parametrize("path", ["/boards/1", "/boards/1/cards"])
+def test_card_delete_moves_last_modified_forward(client, one_board, path):
+    db.session.add_all([
+        Card(message="Older", board_id=1, updated_at=datetime(2026, 1, 1)),
+        Card(message="Newer", board_id=1, updated_at=datetime(2026, 2, 1)),
+    ])
+    db.session.execute(db.update(Board).values(updated_at=datetime(2026, 1, 1)))
+    db.session.commit()
+    last_modified = client.get(path).headers["Last-Modified"]
+
+    client.delete("/cards/2")
+    response = client.get(path, headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+
+
+def test_get_boards_has_no_last_modified(client, three_boards):
+    response = client.get("/boards")
+    assert "Last-Modified" not in response.headers
+
+    client.delete("/boards/3")
+    response = client.get("/boards", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+def test_get_boards_if_none_match(client, three_boards):
+    etag = client.get("/boards").headers["ETag"]
+
+    assert client.get("/boards", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/boards?limit=1", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_get_boards_etag_changes_with_new_board(client, three_boards):
+    etag = client.get("/boards").headers["ETag"]
+    client.post("/boards", json={"title": "New Board", "owner": "Creator"})
+
+    assert client.get("/boards", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_conditional_get_not_found(client):
+    response = client.get("/cards/1", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+
+def test_update_card_if_match(client, one_card):
+    etag = client.get("/cards/1").headers["ETag"]
+
+    response = client.put("/cards/1", json={"message": "Be bold"}, headers={"If-Match": etag})
+
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Be bold"
+    assert client.get("/cards/1").headers["ETag"] != etag
+
+
+def test_update_card_stale_if_match(client, one_card):
+    etag = client.get("/cards/1").headers["ETag"]
+    client.patch("/cards/1/like")
+
+    response = client.put("/cards/1", json={"likes": 0}, headers={"If-Match": etag})
+
+    assert response.status_code == 412
+    assert response.get_json() == {"details": "Precondition failed"}
+    assert client.get("/cards/1").get_json()["likes"] == 1
+
+
+def test_update_board_if_match(client, one_board):
+    etag = client.get("/boards/1").headers["ETag"]
+
+    first = client.put("/boards/1", json={"title": "First"}, headers={"If-Match": etag})
+    second = client.put("/boards/1", json={"title": "Second"}, headers={"If-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert client.get("/boards/1").get_json()["title"] == "First"
+
+
+def test_update_if_match_star(client, one_card):
+    response = client.put("/cards/1", json={"message": "Any"}, headers={"If-Match": "*"})
+
+    assert response.status_code == 200
+
+
+def test_update_lost_race_is_conflict(app, one_card):
+    # The version changed between the If-Match check and the UPDATE
+    with app.test_request_context(method="PUT"):
+        with pytest.raises(HTTPException) as error:
+            update_model(Card, 1, {"message": "Late"}, expected_version=0)
+
+    assert error.value.response.status_code == 409
+    assert error.value.response.get_json() == {"details": "Conflict"}
+
+
+def test_stale_flush_is_conflict(app, client, one_card):
+    @app.put("/test/stale-card")
+    def update_stale_card():
+        card = db.session.get(Card, 1)
+        db.session.execute(db.update(Card.__table__).values(version=Card.__table__.c.version + 1))
+        card.message = "Stale"
+        db.session.commit()
+        return card.to_dict()
+
+    response = client.put("/test/stale-card")
+
+    assert response.status_code == 409
+    assert response.get_json() == {"details": "Conflict"}
+
+
+def test_update_board_if_match_ignores_card_changes(client, board_with_cards):
+    etag = client.get("/boards/1").headers["ETag"]
+    client.patch("/cards/1/like")
+    client.put("/cards/2", json={"message": "Edited"})
+
+    response = client.put("/boards/1", json={"title": "Renamed"}, headers={"If-Match": etag})
+
+    assert response.status_code == 200
+    assert client.get("/boards/1").get_json()["title"] == "Renamed"
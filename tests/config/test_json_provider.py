@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+import pytest
+
+orjson = pytest.importorskip("orjson")
+
+from flask.json.provider import DefaultJSONProvider
+from app.json_provider import OrjsonProvider
+
+
+def test_orjson_provider_is_default(app):
+    assert isinstance(app.json, OrjsonProvider)
+
+
+def test_orjson_provider_matches_default_output(app):
+    payload = {"b": 1, "a": [{"id": 1, "message": "Stay kind"}], "at": datetime(2026, 1, 7, tzinfo=timezone.utc)}
+
+    assert app.json.dumps(payload, separators=(",", ":")) == DefaultJSONProvider(app).dumps(payload, separators=(",", ":"))
+
+
+def test_orjson_provider_response(client, one_card):
+    response = client.get("/cards/1")
+
+    assert response.mimetype == "application/json"
+    assert response.get_data() == b'{"board_id":1,"id":1,"likes":0,"message":"Stay kind"}\n'
+
+
+@pytest.mark.parametrize("app_config", [{"JSON_PROVIDER": "default"}])
+def test_default_provider_can_be_selected(app):
+    assert type(app.json) is DefaultJSONProvider
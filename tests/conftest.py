@@ -6,21 +6,57 @@ from datetime import datetime
 from dotenv import load_dotenv
 from app.models.board import Board
 from app.models.card import Card
+from flask import request as flask_request
 from flask.signals import request_finished
+from app.instrumentation import get_query_count
 
 load_dotenv()
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries): fail the test if any request runs more SQL statements",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+
+    marker = item.get_closest_marker("query_budget")
+    if marker is not None:
+        max_queries = marker.args[0]
+        over_budget = [
+            f"{method} {path} ran {count} queries"
+            for method, path, count in getattr(item, "query_counts", [])
+            if count > max_queries
+        ]
+        if over_budget:
+            pytest.fail(f"Query budget of {max_queries} exceeded: " + "; ".join(over_budget))
+
+    return result
+
+
+@pytest.fixture
+def app_config():
+    # Override in a test module to run its tests against extra app config
+    return {}
+
+
 @pytest.fixture
-def app():
+def app(app_config, request):
     test_config = {
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": os.environ.get("SQLALCHEMY_TEST_DATABASE_URI")
     }
+    test_config.update(app_config)
     app = create_app(test_config)
+    query_counts = request.node.query_counts = []
 
     @request_finished.connect_via(app)
     def expire_session(sender, response, **extra):
+        query_counts.append((flask_request.method, flask_request.path, get_query_count()))
         db.session.remove()
 
     with app.app_context():
@@ -0,0 +1,97 @@
+import json
+import pytest
+from app.events import InProcessBroker
+
+
+def read_event(stream):
+    chunk = next(stream).decode()
+    event_line, data_line, _, _ = chunk.split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+@pytest.fixture
+def board_events(client, one_board):
+    response = client.get("/boards/1/events")
+    stream = iter(response.response)
+    assert next(stream) == b"retry: 3000\n\n"
+    yield stream
+    response.close()
+
+
+def test_broker_delivers_only_to_board_subscribers():
+    broker = InProcessBroker()
+    first = broker.subscribe(1)
+    second = broker.subscribe(2)
+
+    broker.publish(1, {"type": "card.created", "data": {}})
+
+    assert first.get_nowait() == {"type": "card.created", "data": {}}
+    assert second.empty()
+
+
+def test_broker_resyncs_full_queue():
+    broker = InProcessBroker(queue_size=2)
+    subscription = broker.subscribe(1)
+
+    for likes in range(3):
+        broker.publish(1, {"type": "card.liked", "data": {"likes": likes}})
+    broker.publish(1, {"type": "card.liked", "data": {"likes": 3}})
+
+    assert subscription.get_nowait() == {"type": "resync", "data": {"board_id": 1}}
+    assert subscription.get_nowait()["data"] == {"likes": 3}
+    assert subscription.empty()
+
+
+def test_broker_unsubscribe():
+    broker = InProcessBroker()
+    subscription = broker.subscribe(1)
+    broker.unsubscribe(1, subscription)
+
+    broker.publish(1, {"type": "card.created", "data": {}})
+
+    assert subscription.empty()
+
+
+def test_board_events_card_created(client, board_events):
+    client.post("/boards/1/cards", json={"message": "Stay kind"})
+
+    assert read_event(board_events) == (
+        "card.created",
+        {"id": 1, "message": "Stay kind", "likes": 0, "board_id": 1},
+    )
+
+
+def test_board_events_card_liked_and_deleted(client, board_events):
+    client.post("/boards/1/cards", json={"message": "Stay kind"})
+    client.patch("/cards/1/like")
+    client.delete("/cards/1")
+
+    assert [read_event(board_events)[0] for _ in range(3)] == ["card.created", "card.liked", "card.deleted"]
+
+
+def test_board_events_closing_stream_unsubscribes(app, client, one_board):
+    response = client.get("/boards/1/events")
+    response.close()
+
+    assert not app.extensions["event_broker"]._subscribers
+
+
+def test_board_events_board_not_found(client):
+    response = client.get("/boards/1/events")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Board 1 not found"}
+
+
+def test_board_events_bulk_writes_send_one_event(client, board_events):
+    client.post("/boards/1/cards/bulk", json={"messages": ["One", "Two"]})
+    client.delete("/boards/1/cards/bulk", json={"ids": [1, 2]})
+
+    assert read_event(board_events) == (
+        "cards.created",
+        [
+            {"id": 1, "message": "One", "likes": 0, "board_id": 1},
+            {"id": 2, "message": "Two", "likes": 0, "board_id": 1},
+        ],
+    )
+    assert read_event(board_events) == ("cards.deleted", {"ids": [1, 2], "board_id": 1})
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+from app.db import db
+from app.instrumentation import MetricsRegistry
+
+
+def test_metrics_registry_renders_histogram():
+    metrics = MetricsRegistry()
+    metrics.observe_request("boards.get_all_boards", "GET", 200, 0.02, 2, 0.001, 150)
+
+    body = metrics.render()
+
+    assert 'http_requests_total{endpoint="boards.get_all_boards",method="GET",status="200"} 1' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="boards.get_all_boards",method="GET",le="0.01"} 0' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="boards.get_all_boards",method="GET",le="0.025"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="boards.get_all_boards",method="GET"} 1' in body
+    assert 'db_statements_total{endpoint="boards.get_all_boards",method="GET"} 2' in body
+    assert 'http_response_size_bytes_bucket{endpoint="boards.get_all_boards",method="GET",le="1000"} 1' in body
+
+
+def test_metrics_endpoint(client, board_with_cards):
+    client.get("/boards")
+    client.get("/boards/1")
+
+    response = client.get("/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'http_requests_total{endpoint="boards.get_all_boards",method="GET",status="200"} 1' in body
+    assert 'db_statements_total{endpoint="boards.get_one_board",method="GET"} 3' in body
+    assert "response_cache_hits_total" not in body
+
+
+def test_failed_statement_does_not_leak_its_start_time(app, one_board):
+    with app.test_request_context():
+        connection = db.session.connection()
+        with pytest.raises(DBAPIError):
+            db.session.execute(db.text("SELECT * FROM no_such_table"))
+
+        assert connection.info["query_start_times"] == []
+        db.session.rollback()
+
+
+def test_unhandled_error_is_recorded(app, client):
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        client.get("/boom")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'http_requests_total{endpoint="boom",method="GET",status="500"} 1' in body
+
+
+class TestServerTiming:
+    @pytest.fixture
+    def app_config(self):
+        return {"SERVER_TIMING": True}
+
+    def test_server_timing_header(self, client, one_board):
+        response = client.get("/boards/1")
+
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert 'desc="3 queries"' in response.headers["Server-Timing"]
@@ -0,0 +1,52 @@
+import pytest
+
+
+def test_query_count_header(client, board_with_cards):
+    response = client.get("/boards/1/cards")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) > 0
+
+
+@pytest.mark.query_budget(2)
+def test_get_boards_query_budget(client, board_with_cards):
+    client.post("/boards", json={"title": "Weekly Wins", "owner": "Owner"})
+
+    response = client.get("/boards")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(3)
+def test_get_one_board_query_budget(client, board_with_cards):
+    response = client.get("/boards/1")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["cards"]) == 2
+
+
+@pytest.mark.query_budget(3)
+def test_get_cards_for_board_query_budget(client, board_with_cards):
+    response = client.get("/boards/1/cards")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(2)
+def test_card_reads_query_budget(client, board_with_cards):
+    assert client.get("/cards/1").status_code == 200
+
+
+@pytest.mark.query_budget(1)
+def test_card_writes_query_budget(client, board_with_cards):
+    assert client.patch("/cards/1/like").status_code == 200
+    assert client.put("/cards/1", json={"message": "Updated"}).status_code == 200
+    assert client.delete("/cards/1").status_code == 204
+    assert client.delete("/cards/1").status_code == 404
+
+
+@pytest.mark.query_budget(2)
+def test_board_writes_query_budget(client, board_with_cards):
+    assert client.put("/boards/1", json={"title": "Renamed"}).status_code == 200
+    assert client.delete("/boards/1").status_code == 204
+
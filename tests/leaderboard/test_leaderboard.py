@@ -0,0 +1,127 @@
+import pytest
+from app.leaderboard import Leaderboard, RankedSet
+
+
+@pytest.fixture
+def three_cards(client, one_board):
+    for message in ["First", "Second", "Third"]:
+        client.post("/boards/1/cards", json={"message": message})
+
+
+def test_ranked_set_orders_by_score_then_newest():
+    ranked = RankedSet()
+    ranked.set(1, 5)
+    ranked.set(2, 7)
+    ranked.set(3, 5)
+    ranked.set(2, 1)
+    ranked.discard(4)
+
+    assert ranked.top(10) == [(3, 5), (1, 5), (2, 1)]
+    assert len(ranked) == 3
+
+
+def test_ranked_set_load_matches_incremental_sets():
+    scores = {1: 5, 2: 7, 3: 5, 4: 0}
+    incremental = RankedSet()
+    for member, score in scores.items():
+        incremental.set(member, score)
+
+    loaded = RankedSet()
+    loaded.load(scores)
+
+    assert loaded.top(10) == incremental.top(10) == [(2, 7), (3, 5), (1, 5), (4, 0)]
+    loaded.set(4, 6)
+    loaded.discard(2)
+    assert loaded.top(10) == [(4, 6), (3, 5), (1, 5)]
+
+
+def test_trending_prefers_recent_likes(app):
+    now = [0.0]
+    leaderboard = Leaderboard(half_life=60, clock=lambda: now[0])
+    leaderboard._loaded = True
+
+    for _ in range(3):
+        leaderboard.record_like(1, 1, 0)
+    now[0] = 180.0
+    leaderboard.record_like(1, 2, 1)
+
+    assert [card_id for card_id, _ in leaderboard.top("trending", 2)] == [2, 1]
+    assert leaderboard.top("trending", 2)[1][1] == pytest.approx(3 / 8)
+
+
+def test_get_top_cards_by_likes(client, board_with_cards):
+    response = client.get("/cards/top")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert response_body == [
+        {"id": 2, "message": "Keep going", "likes": 1, "board_id": 1, "score": 1},
+        {"id": 1, "message": "You can do it", "likes": 0, "board_id": 1, "score": 0},
+    ]
+
+
+def test_get_top_cards_follows_writes(client, three_cards):
+    client.get("/cards/top")
+
+    client.patch("/cards/3/like")
+    client.patch("/cards/1/like")
+    client.patch("/cards/1/like")
+    client.delete("/cards/2")
+    client.post("/boards/1/cards", json={"message": "Fourth"})
+
+    response = client.get("/cards/top?limit=3")
+
+    assert [(card["id"], card["likes"]) for card in response.get_json()] == [(1, 2), (3, 1), (4, 0)]
+
+
+def test_get_top_cards_follows_bulk_writes(client, three_cards):
+    client.get("/cards/top")
+
+    client.patch("/cards/3/like")
+    client.post("/boards/1/cards/bulk", json={"messages": ["Fourth", "Fifth"]})
+    client.delete("/boards/1/cards/bulk", json={"ids": [1, 2, 4]})
+
+    response = client.get("/cards/top")
+
+    assert [(card["id"], card["likes"]) for card in response.get_json()] == [(3, 1), (5, 0)]
+
+
+def test_resync_event_reloads_leaderboard(app):
+    leaderboard = Leaderboard()
+    leaderboard._loaded = True
+    leaderboard.set_likes(1, 1, 3)
+
+    leaderboard.apply_event(1, {"type": "resync", "data": {"board_id": 1}})
+
+    assert not leaderboard._loaded
+    assert len(leaderboard._likes) == 0
+
+
+def test_get_top_cards_trending(client, three_cards):
+    client.get("/cards/top?mode=trending")
+
+    client.patch("/cards/2/like")
+    response = client.get("/cards/top?mode=trending&limit=1")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert response_body[0]["id"] == 2
+    assert response_body[0]["score"] == pytest.approx(1, rel=1e-3)
+
+
+def test_get_top_cards_drops_deleted_board(client, three_cards):
+    client.get("/cards/top")
+
+    client.delete("/boards/1")
+    response = client.get("/cards/top")
+
+    assert response.get_json() == []
+    assert len(client.application.extensions["leaderboard"]._likes) == 0
+
+
+def test_get_top_cards_invalid_params(client, three_cards):
+    for query in ["mode=recent", "limit=0", "limit=101", "limit=abc"]:
+        response = client.get(f"/cards/top?{query}")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"details": "Invalid data"}
@@ -0,0 +1,187 @@
+import json
+import pytest
+from unittest.mock import ANY
+
+
+def test_get_boards_first_page(client, three_boards):
+    response = client.get("/boards?limit=2")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert [board["id"] for board in response_body] == [1, 2]
+    assert response.headers["X-Next-Cursor"] == "2"
+    assert response.headers["Link"] == '</boards?after_id=2&limit=2>; rel="next"'
+
+
+def test_get_boards_last_page_has_no_cursor(client, three_boards):
+    response = client.get("/boards?after_id=2&limit=2")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert [board["id"] for board in response_body] == [3]
+    assert "X-Next-Cursor" not in response.headers
+    assert "Link" not in response.headers
+
+
+def test_get_boards_after_id_uses_default_limit(client, three_boards):
+    response = client.get("/boards?after_id=1")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert [board["id"] for board in response_body] == [2, 3]
+
+
+def test_get_boards_invalid_page_params(client, three_boards):
+    for query in ["limit=abc", "limit=0", "limit=100000", "after_id=-1"]:
+        response = client.get(f"/boards?{query}")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"details": "Invalid data"}
+
+
+def test_get_cards_for_board_paginated(client, board_with_cards):
+    response = client.get("/boards/1/cards?limit=1")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert [card["id"] for card in response_body] == [1]
+    assert response.headers["Link"] == '</boards/1/cards?after_id=1&limit=1>; rel="next"'
+
+    response = client.get("/boards/1/cards?after_id=1&limit=1")
+
+    assert [card["id"] for card in response.get_json()] == [2]
+    assert "Link" not in response.headers
+
+
+def test_get_boards_stream_ndjson(client, board_with_cards):
+    response = client.get("/boards?format=ndjson")
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line) for line in lines] == [{
+        "id": 1,
+        "title": "Daily Affirmations",
+        "owner": "Test Owner",
+        "card_count": 2,
+        "total_likes": 1,
+        "last_card_at": ANY,
+    }]
+
+
+def test_get_cards_for_board_stream_by_accept_header(client, board_with_cards):
+    response = client.get("/boards/1/cards", headers={"Accept": "application/x-ndjson"})
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.status_code == 200
+    assert [json.loads(line)["message"] for line in lines] == ["You can do it", "Keep going"]
+
+
+def test_get_boards_stream_ndjson_with_limit(client, three_boards):
+    response = client.get("/boards?limit=2&format=ndjson")
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+    assert response.headers["X-Next-Cursor"] == "2"
+    assert "format=ndjson" in response.headers["Link"]
+
+    response = client.get("/boards?after_id=2&limit=2&format=ndjson")
+    assert [json.loads(line)["id"] for line in response.get_data(as_text=True).splitlines()] == [3]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_cards_for_board_stream_ndjson_with_limit(client, board_with_cards):
+    response = client.get("/boards/1/cards?limit=1&format=ndjson")
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["id"] for line in lines] == [1]
+    assert response.headers["X-Next-Cursor"] == "1"
+
+
+def test_get_cards_for_board_sorted_by_likes(client, board_with_cards):
+    response = client.get("/boards/1/cards?sort=likes")
+
+    assert response.status_code == 200
+    assert [card["id"] for card in response.get_json()] == [2, 1]
+
+
+def test_get_cards_for_board_sorted_paginated(client, board_with_cards):
+    client.patch("/cards/1/like")
+
+    response = client.get("/boards/1/cards?sort=likes&limit=1")
+
+    # Both cards have one like, so the newer one comes first
+    assert [card["id"] for card in response.get_json()] == [2]
+    assert response.headers["Link"] == '</boards/1/cards?after=1,2&limit=1&sort=likes>; rel="next"'
+    assert response.headers["X-Next-Cursor"] == "1,2"
+
+    response = client.get("/boards/1/cards?after=1,2&limit=1&sort=likes")
+
+    assert [card["id"] for card in response.get_json()] == [1]
+    assert "Link" not in response.headers
+
+
+@pytest.fixture
+def liked_cards(client, one_board):
+    for likes, message in enumerate(["Zero", "One", "Two", "Three"]):
+        client.post("/boards/1/cards", json={"message": message})
+        for _ in range(likes):
+            client.patch(f"/cards/{likes + 1}/like")
+
+
+def sorted_page(client, cursor):
+    response = client.get(f"/boards/1/cards?sort=likes&limit=2&after={cursor}")
+    return [card["id"] for card in response.get_json()]
+
+
+def test_sorted_page_after_cursor_card_is_deleted(client, liked_cards):
+    cursor = client.get("/boards/1/cards?sort=likes&limit=2").headers["X-Next-Cursor"]
+
+    client.delete("/cards/3")
+
+    assert sorted_page(client, cursor) == [2, 1]
+
+
+def test_sorted_page_after_cursor_card_is_liked(client, liked_cards):
+    cursor = client.get("/boards/1/cards?sort=likes&limit=2").headers["X-Next-Cursor"]
+
+    client.patch("/cards/3/like")
+    client.patch("/cards/3/like")
+
+    assert sorted_page(client, cursor) == [2, 1]
+
+
+@pytest.mark.parametrize("sort", ["likes", "created_at", "updated_at"])
+def test_sorted_pages_visit_every_card_once(client, liked_cards, sort):
+    card_ids, query = [], f"/boards/1/cards?sort={sort}&limit=1"
+    while query:
+        response = client.get(query)
+        card_ids += [card["id"] for card in response.get_json()]
+        query = response.headers.get("Link", "").removeprefix("<").partition(">")[0]
+
+    assert sorted(card_ids) == [1, 2, 3, 4]
+
+
+def test_sorted_ndjson_page_cursor(client, liked_cards):
+    response = client.get("/boards/1/cards?sort=likes&limit=2&format=ndjson")
+
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()][0] == {
+        "id": 4, "message": "Three", "likes": 3, "board_id": 1,
+    }
+    assert response.headers["X-Next-Cursor"] == "2,3"
+
+
+@pytest.mark.parametrize("query", ["after=1,2", "sort=likes&after=abc,2", "sort=likes&after=1", "sort=likes&after_id=2&after=1,2"])
+def test_invalid_sort_cursor(client, liked_cards, query):
+    response = client.get(f"/boards/1/cards?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
+
+
+def test_get_cards_for_board_invalid_sort(client, board_with_cards):
+    response = client.get("/boards/1/cards?sort=message")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
@@ -0,0 +1,79 @@
+import pytest
+from app.rate_limit import MemoryBucketBackend, RedisBucketBackend, TOKEN_BUCKET_SCRIPT
+
+
+@pytest.fixture
+def app_config():
+    return {
+        "RATE_LIMIT_BACKEND": "memory",
+        "RATE_LIMIT_CARD_LIKE": (2, 0.001),
+    }
+
+
+def test_memory_backend_refills_over_time():
+    now = [0.0]
+    backend = MemoryBucketBackend(clock=lambda: now[0])
+
+    assert backend.take("a", 2, 1) == (True, 0.0)
+    assert backend.take("a", 2, 1) == (True, 0.0)
+    assert backend.take("a", 2, 1) == (False, 1.0)
+
+    now[0] = 1.5
+    assert backend.take("a", 2, 1)[0] is True
+    assert backend.take("b", 2, 1)[0] is True
+
+
+def test_memory_backend_drops_least_recently_used():
+    backend = MemoryBucketBackend(maxsize=1)
+    backend.take("a", 1, 0.001)
+    backend.take("b", 1, 0.001)
+
+    # "a" was dropped, so it starts with a full bucket again
+    assert backend.take("a", 1, 0.001)[0] is True
+
+
+def test_redis_backend_runs_script():
+    class FakeRedis:
+        def eval(self, script, key_count, *args):
+            self.call = (script, key_count, *args)
+            return [0, 1500]
+
+    client = FakeRedis()
+    backend = RedisBucketBackend(client, clock=lambda: 10.0)
+
+    assert backend.take("card_like:1", 5, 2) == (False, 1.5)
+    assert client.call == (TOKEN_BUCKET_SCRIPT, 1, "inspiration-board:rate:card_like:1", 5, 2, 10.0)
+
+
+def test_like_card_rate_limited_per_card(client, one_board):
+    client.post("/boards/1/cards", json={"message": "First"})
+    client.post("/boards/1/cards", json={"message": "Second"})
+
+    assert client.patch("/cards/1/like").status_code == 200
+    assert client.patch("/cards/1/like").status_code == 200
+
+    response = client.patch("/cards/1/like")
+
+    assert response.status_code == 429
+    assert response.get_json() == {"details": "Too many requests"}
+    assert int(response.headers["Retry-After"]) >= 1
+    assert client.get("/cards/1").get_json()["likes"] == 2
+
+    assert client.patch("/cards/2/like").status_code == 200
+
+
+def test_like_card_rate_limit_ignores_id_spelling(client, one_card):
+    assert client.patch("/cards/1/like").status_code == 200
+    assert client.patch("/cards/01/like").status_code == 200
+
+    assert client.patch("/cards/001/like").status_code == 429
+    assert client.get("/cards/1").get_json()["likes"] == 2
+
+
+def test_like_card_rate_limited_per_client(client, one_card):
+    client.patch("/cards/1/like")
+    client.patch("/cards/1/like")
+
+    response = client.patch("/cards/1/like", environ_base={"REMOTE_ADDR": "10.0.0.2"})
+
+    assert response.status_code == 200
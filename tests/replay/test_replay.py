@@ -0,0 +1,95 @@
+import json
+import time
+from app.replay import endpoint_name, load_request_log, replay, summarize
+
+
+def write_log(tmp_path, entries):
+    log_path = tmp_path / "requests.jsonl"
+    log_path.write_text("\n".join(json.dumps(entry) for entry in entries) + "\n")
+    return log_path
+
+
+def test_load_request_log_skips_non_requests(tmp_path):
+    log_path = write_log(tmp_path, [
+        {"method": "get", "path": "/boards"},
+        {"request_id": "user-001", "title": "Not a request"},
+        {"method": "POST", "path": "/boards", "json": {"title": "T", "owner": "O"}},
+    ])
+
+    entries, skipped = load_request_log(log_path)
+
+    assert skipped == 1
+    assert [(entry["method"], entry["path"]) for entry in entries] == [("GET", "/boards"), ("POST", "/boards")]
+    assert entries[1]["json"] == {"title": "T", "owner": "O"}
+
+
+def test_load_request_log_skips_malformed_lines(tmp_path):
+    log_path = tmp_path / "requests.jsonl"
+    log_path.write_text('{"path": "/boards"}\nnot json\n{"path": "/boards/1"}\n{"path": "/car')
+
+    entries, skipped = load_request_log(log_path)
+
+    assert skipped == 2
+    assert [entry["path"] for entry in entries] == ["/boards", "/boards/1"]
+
+
+class FailingSender:
+    def send(self, entry):
+        if entry["path"] == "/down":
+            raise ConnectionRefusedError
+        time.sleep(0.01)
+        return 200
+
+
+def test_replay_counts_raising_requests_as_errors():
+    entries = [{"method": "GET", "path": path} for path in ("/down", "/up", "/down")]
+
+    samples, elapsed = replay(entries, FailingSender(), concurrency=2)
+    summary = summarize(samples, elapsed)
+
+    assert [sample[1:3] for sample in samples if sample[1] is None] == [(None, None), (None, None)]
+    assert summary["errors"] == 2
+    assert summary["endpoints"]["GET /down"] == {
+        "requests": 2, "statuses": {"error": 2}, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+    }
+    assert summary["endpoints"]["GET /up"]["p50_ms"] >= 10
+
+
+def test_endpoint_name_groups_ids():
+    assert endpoint_name({"method": "PATCH", "path": "/cards/12/like"}) == "PATCH /cards/<id>/like"
+    assert endpoint_name({"method": "GET", "path": "/boards/3?limit=2"}) == "GET /boards/<id>"
+
+
+def test_replay_command_with_test_client(app, one_board, tmp_path):
+    log_path = write_log(tmp_path, [
+        {"method": "POST", "path": "/boards/1/cards", "json": {"message": "Hello"}},
+        {"method": "PATCH", "path": "/cards/1/like"},
+        {"method": "GET", "path": "/boards/1"},
+        {"method": "GET", "path": "/boards/99"},
+    ])
+    output_path = tmp_path / "summary.json"
+    samples_path = tmp_path / "samples.csv"
+
+    result = app.test_cli_runner().invoke(args=[
+        "replay", str(log_path), "--concurrency", "1",
+        "--output", str(output_path), "--samples", str(samples_path),
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "4 requests" in result.output
+
+    summary = json.loads(output_path.read_text())
+    assert summary["requests"] == 4
+    assert summary["errors"] == 0
+    assert summary["endpoints"]["GET /boards/<id>"]["statuses"] == {"200": 1, "404": 1}
+    assert summary["endpoints"]["PATCH /cards/<id>/like"]["statuses"] == {"200": 1}
+    assert len(samples_path.read_text().splitlines()) == 5
+
+
+def test_replay_command_rejects_empty_log(app, tmp_path):
+    log_path = write_log(tmp_path, [{"title": "Nothing to send"}])
+
+    result = app.test_cli_runner().invoke(args=["replay", str(log_path)])
+
+    assert result.exit_code != 0
+    assert "no replayable requests" in result.output
@@ -0,0 +1,129 @@
+import json
+import pytest
+from app.db import db
+from app.models.board import Board
+from app.replica import REPLICA_BIND, STICKY_COOKIE
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_REPLICA_DATABASE_URI": f"sqlite:///{tmp_path / 'replica.db'}",
+        "REPLICA_STICKY_SECONDS": 30,
+    }
+
+
+@pytest.fixture
+def replica(app):
+    # Stands in for a replica that has not caught up yet: same schema, its own rows
+    engine = db.engines[REPLICA_BIND]
+    db.metadata.create_all(engine)
+    yield engine
+    db.metadata.drop_all(engine)
+    # The bind registered an (empty) metadata on the shared db object, which
+    # would make create_all in later apps without a replica look for it
+    db.metadatas.pop(REPLICA_BIND, None)
+
+
+def add_replica_board(replica, title):
+    with replica.begin() as connection:
+        connection.execute(db.insert(Board.__table__).values(title=title, owner="Replica"))
+
+
+def board_titles(response):
+    assert response.status_code == 200
+    return [board["title"] for board in response.get_json()]
+
+
+def test_get_routes_read_from_replica(client, replica):
+    db.session.add(Board(title="Primary Board", owner="Primary"))
+    db.session.commit()
+    add_replica_board(replica, "Replica Board")
+
+    assert board_titles(client.get("/boards")) == ["Replica Board"]
+    assert client.get("/boards/1").get_json()["title"] == "Replica Board"
+
+    lines = client.get("/boards?format=ndjson").get_data(as_text=True).splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Replica Board"]
+
+
+def test_write_pins_client_to_primary(client, replica):
+    add_replica_board(replica, "Replica Board")
+
+    response = client.post("/boards", json={"title": "New Board", "owner": "Writer"})
+
+    assert response.status_code == 201
+    assert client.get_cookie(STICKY_COOKIE) is not None
+    assert board_titles(client.get("/boards")) == ["New Board"]
+
+    # Once the window is over the client reads from the replica again
+    client.delete_cookie(STICKY_COOKIE)
+    assert board_titles(client.get("/boards")) == ["Replica Board"]
+
+
+def test_write_pins_cross_origin_client(client, replica):
+    add_replica_board(replica, "Replica Board")
+    origin = {"Origin": "http://localhost:3000"}
+
+    response = client.post("/boards", json={"title": "New Board", "owner": "Writer"}, headers=origin)
+
+    # Without both headers a credentialed fetch drops the response and its cookie
+    assert response.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+    assert response.headers["Access-Control-Allow-Credentials"] == "true"
+    assert client.get_cookie(STICKY_COOKIE) is not None
+
+    response = client.get("/boards", headers=origin)
+
+    assert response.headers["Access-Control-Allow-Credentials"] == "true"
+    assert board_titles(response) == ["New Board"]
+
+
+def test_failed_write_does_not_pin(client, replica):
+    response = client.post("/boards", json={"owner": "Writer"})
+
+    assert response.status_code == 400
+    assert client.get_cookie(STICKY_COOKIE) is None
+
+
+def test_writes_go_to_primary(app, client, replica):
+    add_replica_board(replica, "Replica Board")
+    client.post("/boards", json={"title": "New Board", "owner": "Writer"})
+    client.post("/boards/1/cards", json={"message": "Hello"})
+
+    assert db.session.scalars(db.select(Board.title)).all() == ["New Board"]
+    with replica.connect() as connection:
+        assert connection.execute(db.select(Board.__table__.c.title)).scalars().all() == ["Replica Board"]
+
+
+def test_other_routes_read_from_primary(client, replica):
+    db.session.add(Board(title="Primary Board", owner="Primary"))
+    db.session.commit()
+
+    response = client.get("/search?q=Primary")
+
+    assert [board["title"] for board in response.get_json()["boards"]] == ["Primary Board"]
+
+
+class TestReplicaWithCache:
+    @pytest.fixture
+    def app_config(self, tmp_path):
+        return {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+            "SQLALCHEMY_REPLICA_DATABASE_URI": f"sqlite:///{tmp_path / 'replica.db'}",
+            "RESPONSE_CACHE_BACKEND": "lru",
+        }
+
+    def test_pinned_reads_skip_replica_cache_entries(self, app, replica):
+        db.session.add(Board(title="Shared Board", owner="Primary"))
+        db.session.commit()
+        add_replica_board(replica, "Shared Board")
+        writer, reader = app.test_client(), app.test_client()
+
+        writer.post("/boards/1/cards", json={"message": "Hello"})
+        # The lagging replica's board is cached for everyone reading from it
+        assert reader.get("/boards/1").get_json()["cards"] == []
+
+        assert [card["message"] for card in writer.get("/boards/1").get_json()["cards"]] == ["Hello"]
+        assert [card["message"] for card in writer.get("/boards/1/cards").get_json()] == ["Hello"]
+        assert reader.get("/boards/1").get_json()["cards"] == []
@@ -0,0 +1,53 @@
+from sqlalchemy.dialects import postgresql
+from app.models.card import Card
+from app.search import _apply_search
+
+
+def test_search_boards_and_cards(client, board_with_cards):
+    response = client.get("/search?q=keep")
+    response_body = response.get_json()
+
+    assert response.status_code == 200
+    assert response_body == {
+        "boards": [],
+        "cards": [{"id": 2, "message": "Keep going", "likes": 1, "board_id": 1}],
+    }
+
+
+def test_search_matches_board_title_and_owner(client, three_boards):
+    assert [board["id"] for board in client.get("/search?q=owner 2").get_json()["boards"]] == [2]
+    assert [board["title"] for board in client.get("/search?q=wins").get_json()["boards"]] == ["Weekly Wins"]
+
+
+def test_search_requires_every_term(client, board_with_cards):
+    response = client.get("/search?q=you going")
+
+    assert response.get_json() == {"boards": [], "cards": []}
+
+
+def test_search_escapes_like_wildcards(client, board_with_cards):
+    assert client.get("/search?q=%25").get_json()["cards"] == []
+
+
+def test_search_paginates(client, three_boards):
+    first_page = client.get("/search?q=owner&limit=2").get_json()["boards"]
+    second_page = client.get("/search?q=owner&limit=2&offset=2").get_json()["boards"]
+
+    assert [board["id"] for board in first_page] == [1, 2]
+    assert [board["id"] for board in second_page] == [3]
+
+
+def test_search_invalid_params(client):
+    for query in ["", "q=", "q=kind&limit=0", "q=kind&limit=101", "q=kind&offset=-1", "q=kind&limit=abc"]:
+        response = client.get(f"/search?{query}")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"details": "Invalid data"}
+
+
+def test_search_uses_tsvector_on_postgres():
+    query = _apply_search(Card.select_payloads(), "cards", "stay kind", Card.id, [Card.message], "postgresql")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "cards.search_vector @@ websearch_to_tsquery" in sql
+    assert "ORDER BY ts_rank(cards.search_vector" in sql
@@ -0,0 +1,107 @@
+import gzip
+import json
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+
+
+def read_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_board(client, board_with_cards, three_boards):
+    response = client.get("/boards/1/export")
+    records = read_lines(response)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="board-1.ndjson"'
+    assert [(record["type"], record["id"]) for record in records] == [("board", 1), ("card", 1), ("card", 2)]
+    assert records[2]["message"] == "Keep going"
+    assert records[2]["likes"] == 1
+    assert "created_at" in records[0]
+
+
+def test_export_all_boards_gzip(client, board_with_cards, three_boards):
+    client.delete("/boards/2")
+
+    response = client.get("/boards/export?gzip=1")
+    records = [json.loads(line) for line in gzip.decompress(response.get_data()).splitlines()]
+
+    assert response.mimetype == "application/gzip"
+    assert [(record["type"], record["id"]) for record in records] == [
+        ("board", 1), ("board", 3), ("board", 4), ("card", 1), ("card", 2),
+    ]
+
+
+def test_export_missing_board(client):
+    response = client.get("/boards/1/export")
+
+    assert response.status_code == 404
+    assert response.get_json() == {"message": "Board 1 not found"}
+
+
+def test_import_round_trip_remaps_ids(client, board_with_cards):
+    snapshot = client.get("/boards/1/export").get_data()
+
+    response = client.post("/boards/import", data=snapshot, content_type="application/x-ndjson")
+
+    assert response.status_code == 201
+    assert response.get_json() == {"boards": 1, "cards": 2}
+
+    board = client.get("/boards/2").get_json()
+    assert board["title"] == "Daily Affirmations"
+    assert [(card["id"], card["message"], card["likes"], card["board_id"]) for card in board["cards"]] == [
+        (3, "You can do it", 0, 2),
+        (4, "Keep going", 1, 2),
+    ]
+
+
+def test_import_gzip_upload(client, board_with_cards):
+    snapshot = client.get("/boards/export?gzip=1").get_data()
+
+    response = client.post(
+        "/boards/import",
+        data=snapshot,
+        content_type="application/x-ndjson",
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 201
+    assert response.get_json() == {"boards": 1, "cards": 2}
+
+
+def test_import_invalid_snapshot_rolls_back(client, one_board):
+    lines = [
+        {"type": "board", "id": 9, "title": "Imported", "owner": "Owner"},
+        {"type": "card", "id": 1, "board_id": 8, "message": "Orphan"},
+    ]
+    data = "\n".join(json.dumps(line) for line in lines)
+
+    response = client.post("/boards/import", data=data, content_type="application/x-ndjson")
+
+    assert response.status_code == 400
+    assert response.get_json() == {"details": "Invalid data"}
+    assert db.session.scalar(db.select(db.func.count(Board.id))) == 1
+
+
+def test_export_and_import_commands_keep_ids(app, client, board_with_cards, tmp_path):
+    path = tmp_path / "boards.ndjson.gz"
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["export-boards", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "Wrote 3 records" in result.output
+
+    db.session.execute(db.delete(Card))
+    db.session.execute(db.delete(Board))
+    db.session.commit()
+
+    result = runner.invoke(args=["import-boards", str(path), "--keep-ids", "--batch-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Imported 1 boards and 2 cards" in result.output
+    assert [card["id"] for card in client.get("/boards/1").get_json()["cards"]] == [1, 2]
+
+    result = runner.invoke(args=["import-boards", str(path), "--keep-ids"])
+    assert result.exit_code != 0
+    assert "invalid snapshot" in result.output
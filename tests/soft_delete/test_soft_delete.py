@@ -0,0 +1,70 @@
+from app.db import db
+from app.models.board import Board
+from app.models.card import Card
+from app.soft_delete import purge_deleted
+
+
+def count_rows(model):
+    # Core query on the table, so soft-deleted rows are counted too
+    table = model.__table__
+    return db.session.scalar(db.select(db.func.count()).select_from(table))
+
+
+def test_delete_board_keeps_rows_but_hides_them(client, board_with_cards):
+    response = client.delete("/boards/1")
+
+    assert response.status_code == 204
+    assert count_rows(Board) == 1
+    assert count_rows(Card) == 2
+    assert client.get("/boards/1").status_code == 404
+    assert client.get("/boards").get_json() == []
+    assert client.get("/cards/1").status_code == 404
+    assert client.patch("/cards/1/like").status_code == 404
+    assert client.get("/search?q=going").get_json() == {"boards": [], "cards": []}
+    assert client.delete("/boards/1").status_code == 404
+
+
+def test_delete_card_hides_it_from_board(client, board_with_cards):
+    etag = client.get("/boards").headers["ETag"]
+
+    response = client.delete("/cards/1")
+
+    assert response.status_code == 204
+    assert count_rows(Card) == 2
+    assert [card["id"] for card in client.get("/boards/1").get_json()["cards"]] == [2]
+    assert client.get("/boards").get_json()[0]["card_count"] == 1
+    assert client.get("/boards", headers={"If-None-Match": etag}).status_code == 200
+    assert client.delete("/cards/1").status_code == 404
+
+
+def test_bulk_delete_skips_deleted_cards(client, board_with_cards):
+    client.delete("/cards/1")
+
+    response = client.delete("/boards/1/cards/bulk", json={"ids": [1, 2]})
+
+    assert response.status_code == 404
+    assert client.get("/cards/2").status_code == 200
+
+
+def test_purge_deleted_removes_rows_in_batches(app, client, three_boards):
+    for board_id in (1, 2):
+        for message in ["One", "Two", "Three"]:
+            client.post(f"/boards/{board_id}/cards", json={"message": message})
+    client.delete("/boards/1")
+    client.delete("/cards/4")
+
+    assert purge_deleted(older_than=3600) == (0, 0)
+    assert purge_deleted(older_than=0, batch_size=2) == (1, 4)
+    assert count_rows(Board) == 2
+    assert count_rows(Card) == 2
+    assert [card["id"] for card in client.get("/boards/2").get_json()["cards"]] == [5, 6]
+
+
+def test_purge_deleted_command(app, client, one_card):
+    client.delete("/cards/1")
+
+    result = app.test_cli_runner().invoke(args=["purge-deleted", "--older-than", "0"])
+
+    assert result.exit_code == 0, result.output
+    assert "Purged 0 boards and 1 cards" in result.output
+    assert count_rows(Card) == 0